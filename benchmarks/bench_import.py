@@ -0,0 +1,56 @@
+"""Measures `import envbox` time in a fresh interpreter.
+
+Usage:
+
+    python benchmarks/bench_import.py [runs]
+
+"""
+import subprocess
+import sys
+from statistics import median
+
+MODULES_HEAVY = ('ast', 'inspect', 'typing', 'envbox.base', 'envbox.envs', 'envbox.utils')
+"""Modules not expected to be imported by `import envbox`."""
+
+
+def measure_import(module: str = 'envbox', *, runs: int = 20) -> dict:
+    """Returns import time stats (in microseconds) for the given module.
+
+    :param module:
+
+    :param runs: Number of fresh interpreter runs.
+
+    """
+    timings = []
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, check=True,
+        )
+        # last line is for the module itself: "import time: self | cumulative | name"
+        line = result.stderr.strip().splitlines()[-1]
+        timings.append(int(line.split('|')[1]))
+
+    return {'min': min(timings), 'median': median(timings), 'runs': runs}
+
+
+def get_heavy_imported(module: str = 'envbox') -> list[str]:
+    """Returns names of heavy modules imported along with the given module.
+
+    :param module:
+
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', f'import sys, {module}; print(" ".join(sys.modules))'],
+        capture_output=True, text=True, check=True,
+    )
+    imported = set(result.stdout.split())
+
+    return [name for name in MODULES_HEAVY if name in imported]
+
+
+if __name__ == '__main__':
+    stats = measure_import(runs=int(sys.argv[1]) if len(sys.argv) > 1 else 20)
+    print(f"import envbox: min {stats['min']} us, median {stats['median']} us ({stats['runs']} runs)")
+    print(f'heavy modules imported: {get_heavy_imported() or "none"}')
@@ -0,0 +1,303 @@
+"""envbox hot paths benchmarks.
+
+Usage:
+
+    python benchmarks/run.py [--filter SUBSTR] [--json PATH] [--compare PATH] [--repeat N]
+
+Results are printed as a table and optionally saved as JSON
+to be compared between releases (see --compare).
+
+"""
+import json
+import os
+import platform
+import sys
+import tempfile
+from argparse import ArgumentParser
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from timeit import Timer
+
+from bench_import import measure_import
+
+import envbox
+from envbox import get_environment, invalidate
+from envbox.envs import Development
+from envbox.settings import SettingsBase
+from envbox.utils import _cast_cached, cast_type, read_envfile
+
+CASES: dict[str, Callable] = {}
+
+
+def case(name: str):
+    """Registers a benchmark case.
+
+    Case is a generator function yielding a callable to time.
+    Code after `yield` is used for cleanup.
+
+    :param name:
+
+    """
+    def register(func):
+        CASES[name] = func
+        return func
+
+    return register
+
+
+@contextmanager
+def envfile(lines: list[str]):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / '.env'
+        path.write_text('\n'.join(lines))
+        yield path
+
+
+def lines_plain(count: int) -> list[str]:
+    return [f'BENCH_KEY_{idx} = value_{idx}' for idx in range(count)]
+
+
+def lines_multiline(count: int) -> list[str]:
+    lines = []
+
+    for idx in range(count):
+        lines.extend([f'BENCH_MULTI_{idx} = "', 'line one', 'line two', '"'])
+
+    return lines
+
+
+def lines_templated(count: int) -> list[str]:
+    # templates reference variables defined later
+    lines = [f'BENCH_TPL_{idx} = ${{BENCH_BASE_{idx}}}/{idx}' for idx in range(count)]
+    lines.extend(f'BENCH_BASE_{idx} = base' for idx in range(count))
+    return lines
+
+
+def bench_read_envfile(lines: list[str], **kwargs):
+    with envfile(lines) as path:
+        yield lambda: read_envfile(path, **kwargs)
+
+
+case('read_envfile:small')(lambda: bench_read_envfile(lines_plain(10)))
+case('read_envfile:large')(lambda: bench_read_envfile(lines_plain(10_000)))
+case('read_envfile:large:mmap')(lambda: bench_read_envfile(lines_plain(10_000), use_mmap=True))
+case('read_envfile:large:mmap:prefix')(
+    lambda: bench_read_envfile(lines_plain(10_000), use_mmap=True, prefix='BENCH_KEY_1')
+)
+case('read_envfile:templated')(lambda: bench_read_envfile(lines_templated(5_000)))
+case('read_envfile:multiline')(lambda: bench_read_envfile(lines_multiline(2_500)))
+
+
+def bench_cast_type(value: str, *, warm: bool):
+
+    def cast_cold():
+        _cast_cached.cache_clear()
+        cast_type(value)
+
+    yield (lambda: cast_type(value)) if warm else cast_cold
+
+
+for kind, value in {
+    'int': '12345',
+    'float': '12.5',
+    'bool': 'True',
+    'none': 'None',
+    'str': 'some string',
+    'list': '[1, 2, 3]',
+}.items():
+    case(f'cast_type:{kind}:cold')(lambda value=value: bench_cast_type(value, warm=False))
+    case(f'cast_type:{kind}:warm')(lambda value=value: bench_cast_type(value, warm=True))
+
+
+def bench_getmany(count: int, *, index: bool):
+    env = Development(prefix_index=index)
+    env.env = {f'BENCH_VAR_{idx}': f'{idx}' for idx in range(count)}
+    env.setmany({f'{idx}': f'{idx}' for idx in range(10)}, prefix='APP_DB_')
+
+    yield lambda: env.getmany('APP_DB_')
+
+
+for count in (10, 1_000, 10_000):
+    case(f'getmany:{count}')(lambda count=count: bench_getmany(count, index=False))
+    case(f'getmany:{count}:indexed')(lambda count=count: bench_getmany(count, index=True))
+
+
+@case('gettree:1000:indexed')
+def bench_gettree():
+    env = Development(prefix_index=True)
+    env.env = {f'BENCH_VAR_{idx}': f'{idx}' for idx in range(1_000)}
+    env.setmany({f'SECTION_{idx // 10}__KEY_{idx}': f'{idx}' for idx in range(100)}, prefix='APP_')
+
+    yield lambda: env.gettree('APP_')
+
+
+def bench_get_batch(count: int, *, batch: bool):
+    env = Development(env={f'BENCH_VAR_{idx}': f'{idx % 5}' for idx in range(count)})
+    keys = list(env.env)
+
+    if batch:
+        yield lambda: env.get_batch(keys, type_cast=True)
+
+    else:
+        yield lambda: {key: env.get(key, type_cast=True) for key in keys}
+
+
+case('get:40')(lambda: bench_get_batch(40, batch=False))
+case('get_batch:40')(lambda: bench_get_batch(40, batch=True))
+
+
+@case('environment:eq')
+def bench_environment_eq():
+    env = Development()
+    yield lambda: env == 'production'
+
+
+def bench_environment_attr(*, known: bool = False, write: bool = False):
+    env = Development(env={'BENCH_ATTR': 'value'})
+
+    if not write:
+        yield lambda: env.BENCH_ATTR
+
+    elif known:
+        yield lambda: setattr(env, 'type_cast', False)
+
+    else:
+        yield lambda: setattr(env, 'BENCH_ATTR', 'value')
+
+
+case('environment:attr:get')(lambda: bench_environment_attr())
+case('environment:attr:set')(lambda: bench_environment_attr(write=True))
+case('environment:attr:set:known')(lambda: bench_environment_attr(known=True, write=True))
+
+
+def bench_get_environment(detector: str, **kwargs):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / 'environment'
+        path.write_text('production')
+        opts = {'file': {'source': f'{path}'}}
+
+        yield lambda: get_environment(detectors=[detector], detectors_opts=opts, **kwargs)
+
+    invalidate()
+
+
+case('get_environment:environ')(lambda: bench_get_environment('environ', use_envfiles=False))
+case('get_environment:environ:envfiles')(lambda: bench_get_environment('environ'))
+case('get_environment:file')(lambda: bench_get_environment('file', use_envfiles=False))
+case('get_environment:cached')(lambda: bench_get_environment('environ', cached=True))
+
+
+def get_settings():
+
+    class Settings(SettingsBase):
+
+        BENCH_ONE = 1
+        BENCH_TWO = 'two'
+
+    return Settings()
+
+
+@case('settings:read:cold')
+def bench_settings_cold():
+
+    def read():
+        invalidate()
+        get_settings().BENCH_ONE  # noqa: B018
+
+    yield read
+
+
+@case('settings:read:warm')
+def bench_settings_warm():
+    os.environ['BENCH_ONE'] = '10'
+    settings = get_settings()
+
+    yield lambda: settings.BENCH_ONE
+
+    del os.environ['BENCH_ONE']
+
+
+@case('settings:snapshot')
+def bench_settings_snapshot():
+    settings = get_settings()
+    yield settings.snapshot
+
+
+@case('settings:snapshot:read')
+def bench_settings_snapshot_read():
+    snapshot = get_settings().snapshot()
+    yield lambda: snapshot.BENCH_ONE
+
+
+def run_case(name: str, *, repeat: int = 5) -> dict:
+    bench = CASES[name]()
+    func = next(bench)
+
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    timings = [timing / number for timing in timer.repeat(repeat=repeat, number=number)]
+
+    # let case clean up
+    next(bench, None)
+
+    best = min(timings)
+
+    return {
+        'name': name,
+        'best_us': round(best * 1e6, 3),
+        'mean_us': round(sum(timings) / len(timings) * 1e6, 3),
+        'ops_per_sec': round(1 / best),
+        'loops': number,
+        'repeat': repeat,
+    }
+
+
+def main():
+    parser = ArgumentParser(description='envbox benchmarks')
+    parser.add_argument('--filter', default='', help='Run only cases with names containing the given string')
+    parser.add_argument('--json', default='', help='Save results into the given JSON file')
+    parser.add_argument('--compare', default='', help='Compare results with ones from the given JSON file')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timings for every case')
+    args = parser.parse_args()
+
+    previous = {}
+
+    if args.compare:
+        previous = {result['name']: result for result in json.loads(Path(args.compare).read_text())['results']}
+
+    def report(result: dict):
+        line = f"{result['name']:<40} {result['best_us']:>12.3f} us"
+
+        if (result_prev := previous.get(result['name'])) is not None:
+            change = (result['best_us'] / result_prev['best_us'] - 1) * 100
+            line = f'{line} {change:>+8.1f}%'
+
+        print(line)
+
+    results = []
+
+    for name in CASES:
+        if args.filter in name:
+            result = run_case(name, repeat=args.repeat)
+            results.append(result)
+            report(result)
+
+    if args.filter in 'import':
+        stats = measure_import(runs=args.repeat)
+        result = {'name': 'import', 'best_us': stats['min'], 'mean_us': stats['median'], 'repeat': args.repeat}
+        results.append(result)
+        report(result)
+
+    if args.json:
+        data = {
+            'envbox': envbox.VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        Path(args.json).write_text(json.dumps(data, indent=2))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
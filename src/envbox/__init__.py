@@ -1,7 +1,12 @@
-from .base import get_environment, import_by_environment
-from .envs import DEVELOPMENT, PRODUCTION, STAGING, TESTING, Environment, register_type
-from .settings import SettingsBase
-from .utils import read_envfile
+from importlib import import_module
+
+TYPE_CHECKING = False  # not importing `typing` to keep `import envbox` cheap
+
+if TYPE_CHECKING:  # pragma: nocover
+    from .base import aget_environment, get_environment, import_by_environment, invalidate
+    from .envs import DEVELOPMENT, PRODUCTION, STAGING, TESTING, Environment, OverlayEnviron, register_type
+    from .settings import SettingsBase
+    from .utils import aread_envfile, read_envfile
 
 VERSION = '2.0.1'
 
@@ -12,9 +17,54 @@ __all__ = [
     'TESTING',
     'VERSION',
     'Environment',
+    'OverlayEnviron',
     'SettingsBase',
+    'aget_environment',
+    'aread_envfile',
     'get_environment',
     'import_by_environment',
+    'invalidate',
     'read_envfile',
     'register_type',
-]
\ No newline at end of file
+]
+
+# Symbols are imported on first access to keep `import envbox` cheap.
+_LAZY = {
+    'DEVELOPMENT': 'envs',
+    'PRODUCTION': 'envs',
+    'STAGING': 'envs',
+    'TESTING': 'envs',
+    'Environment': 'envs',
+    'OverlayEnviron': 'envs',
+    'SettingsBase': 'settings',
+    'aget_environment': 'base',
+    'aread_envfile': 'utils',
+    'get_environment': 'base',
+    'import_by_environment': 'base',
+    'invalidate': 'base',
+    'read_envfile': 'utils',
+    'register_type': 'envs',
+}
+
+# Submodules are imported on first access as well (e.g. `envbox.detectors`).
+_SUBMODULES = frozenset(('base', 'cli', 'detectors', 'envs', 'handoff', 'settings', 'timings', 'utils', 'watcher'))
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+
+    if module_name is None:
+
+        if name in _SUBMODULES:
+            return import_module(f'.{name}', __name__)
+
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
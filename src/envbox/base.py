@@ -1,10 +1,54 @@
 import sys
+from collections.abc import MutableMapping
 from importlib import import_module
-from inspect import currentframe
 from pathlib import Path
 
-from .detectors import DETECTORS, Detector, get_detector
+from .detectors import _PROBES, DETECTORS, Detector, DetectorsChain, get_detector
 from .envs import DEVELOPMENT, Environment, get_type
+from .timings import COLLECTORS, record
+
+_CACHE: dict[tuple, Environment | None] = {}
+_UNSET = object()
+
+
+def invalidate():
+    """Drops environment objects cached by `get_environment(cached=True)`
+    and detectors probe results cached by `DetectorsChain`.
+
+    Call this when detection sources (e.g. `PYTHON_ENV`) or .env files
+    are changed and a fresh environment resolution is required.
+
+    """
+    _CACHE.clear()
+    _PROBES.clear()
+
+
+def _get_cache_key(
+        default: str | Environment | None,
+        detectors: list[Detector] | None,
+        detectors_opts: dict | None,
+        use_envfiles: bool,  # noqa: FBT001
+        env: MutableMapping | None,
+) -> tuple | None:
+
+    if detectors is not None:
+        detectors = tuple(detectors)
+
+    try:
+        if detectors_opts:
+            detectors_opts = frozenset(
+                (detector, frozenset(opts.items())) for detector, opts in detectors_opts.items()
+            )
+
+        # Storage object is identified by id. Cached environment object keeps a reference to it.
+        key = (default, detectors, detectors_opts or None, use_envfiles, None if env is None else id(env))
+        hash(key)
+
+    except TypeError:
+        # unhashable options, not cached
+        return None
+
+    return key
 
 
 def get_environment(
@@ -12,7 +56,9 @@ def get_environment(
         default: str | Environment | None = DEVELOPMENT,
         detectors: list[Detector] | None = None,
         detectors_opts: dict | None = None,
-        use_envfiles: bool = True
+        use_envfiles: bool = True,
+        cached: bool = False,
+        env: MutableMapping | None = None,
 ) -> Environment | None:
     """Returns current environment type object.
 
@@ -20,6 +66,7 @@ def get_environment(
 
     :param detectors: List of environment detectors to be used in chain.
         If not set, default builtin chain is used.
+        See `DetectorsChain` for parallel probing and probe results caching.
 
     :param detectors_opts: Detectors options dictionary.
         Where keys are detector names and values are keyword arguments dicts.
@@ -27,7 +74,106 @@ def get_environment(
     :param use_envfiles: Whether to set environment variables (if not already set)
         using data from .env files.
 
+    :param cached: Whether to reuse an environment object resolved earlier
+        in this process for the same arguments.
+        Detectors are not probed and .env files are not read on subsequent calls.
+        Calls with unhashable detectors options are not cached.
+        Use `invalidate()` to drop cached objects.
+
+    :param env: Environment variables storage to be used instead of `os.environ`
+        (e.g. `OverlayEnviron` to avoid OS environment updates on .env files loading).
+
+    """
+    key = _get_cache_key(default, detectors, detectors_opts, use_envfiles, env) if cached else None
+
+    if key is not None:
+
+        try:
+            result = _CACHE[key]
+
+        except KeyError:
+            COLLECTORS and record('cache.environment.miss')
+            result = _CACHE[key] = get_environment(
+                default=default,
+                detectors=detectors,
+                detectors_opts=detectors_opts,
+                use_envfiles=use_envfiles,
+                env=env,
+            )
+            return result
+
+        COLLECTORS and record('cache.environment.hit')
+
+        return result
+
+    env_type = _detect_type(default=default, detectors=detectors, detectors_opts=detectors_opts)
+
+    result = None
+
+    if env_type is not None:
+        result = env_type(env=env)
+        use_envfiles and result.update_from_envfiles()
+
+    return result
+
+
+async def aget_environment(
+        *,
+        default: str | Environment | None = DEVELOPMENT,
+        detectors: list[Detector] | None = None,
+        detectors_opts: dict | None = None,
+        use_envfiles: bool = True,
+        cached: bool = False,
+        env: MutableMapping | None = None,
+) -> Environment | None:
+    """Asynchronous version of `get_environment()`.
+
+    Detectors are probed in a thread, .env files are read concurrently in threads.
+
     """
+    import asyncio  # noqa: PLC0415
+
+    key = _get_cache_key(default, detectors, detectors_opts, use_envfiles, env) if cached else None
+
+    if key is not None:
+        result = _CACHE.get(key, _UNSET)
+
+        if result is not _UNSET:
+            COLLECTORS and record('cache.environment.hit')
+            return result
+
+        COLLECTORS and record('cache.environment.miss')
+        result = _CACHE[key] = await aget_environment(
+            default=default,
+            detectors=detectors,
+            detectors_opts=detectors_opts,
+            use_envfiles=use_envfiles,
+            env=env,
+        )
+        return result
+
+    env_type = await asyncio.to_thread(
+        _detect_type, default=default, detectors=detectors, detectors_opts=detectors_opts
+    )
+
+    result = None
+
+    if env_type is not None:
+        result = env_type(env=env)
+
+        if use_envfiles:
+            await result.aupdate_from_envfiles()
+
+    return result
+
+
+def _detect_type(
+        *,
+        default: str | Environment | None,
+        detectors: list[Detector] | None,
+        detectors_opts: dict | None,
+) -> type[Environment] | None:
+
     detectors_opts = detectors_opts or {}
 
     if detectors is None:
@@ -35,27 +181,16 @@ def get_environment(
 
     env_type = None
 
-    for detector in detectors:
-        opts = detectors_opts.get(detector, {})
-        detector = get_detector(detector)
-
-        detector = detector(**opts)
-        env_name = detector.probe()
+    chain = DetectorsChain([get_detector(detector)(**detectors_opts.get(detector, {})) for detector in detectors])
+    env_name = chain.probe()
 
-        if env_name:
-            env_type = get_type(env_name)
-            break
+    if env_name:
+        env_type = get_type(env_name)
 
     if env_type is None and default is not None:
         env_type = get_type(default)
 
-    env = None
-
-    if env_type is not None:
-        env = env_type()
-        use_envfiles and env.update_from_envfiles()
-
-    return env
+    return env_type
 
 
 def import_by_environment(
@@ -103,7 +238,7 @@ def import_by_environment(
 
     module_name_pattern = f'.{module_name_pattern}'
 
-    settings_module = currentframe().f_back
+    settings_module = sys._getframe(1)
     filedir = Path(settings_module.f_code.co_filename).parent
 
     if not package_name:
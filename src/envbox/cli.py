@@ -1,6 +1,7 @@
 import click
 
 from envbox import VERSION, get_environment
+from envbox.timings import collect_timings
 
 
 @click.group()
@@ -10,12 +11,22 @@ def entry_point():
 
 
 @entry_point.command()
-def probe():
+@click.option('--timings', is_flag=True, help='Print out environment resolution timings.')
+def probe(timings):
     """Detect and print out current environment type."""
-    env = get_environment()
+    if timings:
+        with collect_timings() as report:
+            env = get_environment()
+
+    else:
+        env = get_environment()
 
     click.secho(f'Detected environment type: {env} ({env.__class__.__name__})')
 
+    if timings:
+        click.secho(f'Files used: {", ".join(env.envfiles) or "-"}')
+        click.secho(f'{report}')
+
 
 @entry_point.command()
 def show():
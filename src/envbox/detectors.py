@@ -1,14 +1,24 @@
+from collections.abc import Sequence
 from os import environ
 from pathlib import Path
+from time import monotonic
+
+from .timings import COLLECTORS, measure, record
 
 DETECTORS: dict[str, type['Detector']] = {}
 
+_PROBES: dict[tuple, tuple[float, str | None]] = {}
+"""Cached probe results: detector key to (expiration time, result) mapping."""
+
 
 class Detector:
 
     name = 'dummy'
     source = None
 
+    timeout: float | None = None
+    """Probe timeout in seconds. Only applies to parallel probing (see `DetectorsChain`)."""
+
     def __init__(self, **kwargs):
         self.__dict__.update(kwargs)
 
@@ -48,6 +58,139 @@ class File(Detector):
         return env_name
 
 
+class DetectorsChain:
+    """Probes detectors in order returning the first positive result.
+
+    Detectors may be probed concurrently in threads (see `parallel`).
+    Chain order is still honored: the result of the first detector
+    with a positive result is used even if others respond earlier.
+
+    Probe results may be cached for a while (see `ttl`).
+
+    Defaults for `get_environment()` could be set on class level:
+
+    ```python
+    DetectorsChain.parallel = True
+    DetectorsChain.ttl = 30
+    ```
+
+    """
+    parallel: bool = False
+    """Whether to probe detectors concurrently in a thread pool.
+    Detectors `timeout` is respected: results of detectors exceeding it are ignored.
+
+    !!! note
+        Threads of timed out probes are not interrupted and are left to finish.
+
+    """
+
+    ttl: float = 0
+    """Number of seconds to cache probe results for (per process).
+    Cached results are dropped by `envbox.invalidate()`.
+
+    """
+
+    def __init__(self, detectors: Sequence[Detector], *, parallel: bool | None = None, ttl: float | None = None):
+        """
+        :param detectors: Detector objects in order of priority.
+
+        :param parallel: Whether to probe detectors concurrently.
+
+        :param ttl: Number of seconds to cache probe results for.
+
+        """
+        self.detectors = detectors
+
+        if parallel is not None:
+            self.parallel = parallel
+
+        if ttl is not None:
+            self.ttl = ttl
+
+    def probe(self) -> str | None:
+        """Returns environment name from the first detector with a positive result."""
+        detectors = self.detectors
+
+        if self.parallel and len(detectors) > 1:
+            return self._probe_parallel()
+
+        for detector in detectors:
+            env_name = self._probe(detector)
+
+            if env_name:
+                return env_name
+
+        return None
+
+    def _probe_parallel(self) -> str | None:
+        from concurrent.futures import ThreadPoolExecutor, TimeoutError  # noqa: PLC0415
+
+        detectors = self.detectors
+        started = monotonic()
+
+        executor = ThreadPoolExecutor(max_workers=len(detectors), thread_name_prefix='envbox-detector')
+
+        try:
+            futures = [executor.submit(self._probe, detector) for detector in detectors]
+
+            for detector, future in zip(detectors, futures, strict=True):
+                timeout = detector.timeout
+
+                if timeout is not None:
+                    timeout = max(started + timeout - monotonic(), 0)
+
+                try:
+                    env_name = future.result(timeout)
+
+                except TimeoutError:
+                    COLLECTORS and record(f'detect.{detector.name}.timeout')
+                    continue
+
+                if env_name:
+                    return env_name
+
+            return None
+
+        finally:
+            # do not wait for lower priority or timed out probes
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _probe(self, detector: Detector) -> str | None:
+        ttl = self.ttl
+        key = None
+
+        if ttl > 0 and (key := _get_probe_key(detector)) is not None:
+            cached = _PROBES.get(key)
+
+            if cached is not None and cached[0] > monotonic():
+                COLLECTORS and record('cache.probe.hit')
+                return cached[1]
+
+            COLLECTORS and record('cache.probe.miss')
+
+        with measure(f'detect.{detector.name}'):
+            env_name = detector.probe()
+
+        if key is not None:
+            _PROBES[key] = (monotonic() + ttl, env_name)
+
+        return env_name
+
+
+def _get_probe_key(detector: Detector) -> tuple | None:
+    # Detectors of the same type with the same options share results.
+    key = (type(detector), tuple(sorted(vars(detector).items())))
+
+    try:
+        hash(key)
+
+    except TypeError:
+        # unhashable options, not cached
+        return None
+
+    return key
+
+
 def register_detector(detector: type[Detector]):
     """Registers an environment detector.
 
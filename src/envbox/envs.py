@@ -1,8 +1,16 @@
 import os
-from collections.abc import Sequence
-from typing import Any, ClassVar
+import sys
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from .utils import cast_type, read_envfile
+from .timings import measure
+from .utils import _MUTABLE, _get_key_filter, cast_type, expand_vars, get_snapshot
+
+if TYPE_CHECKING:
+    from .watcher import EnvfilesWatcher
 
 DEVELOPMENT = 'development'
 TESTING = 'testing'
@@ -11,8 +19,156 @@ PRODUCTION = 'production'
 
 TYPES: dict[str, type['Environment']] = {}
 
+_UNSET = object()
+
+
+class OverlayEnviron(MutableMapping):
+    """In-memory layer on top of environment variables mapping (`os.environ` by default).
+
+    Reads go through to the underlying mapping, while changes (sets and deletions)
+    are kept in memory, thus not paying for OS environment updates.
+    Use .export() to push the changes into the underlying mapping
+    (e.g. before starting subprocesses).
+
+    """
+
+    def __init__(self, base: MutableMapping | None = None):
+        """
+        :param base: Underlying mapping. Default: `os.environ`.
+
+        """
+        self.base = os.environ if base is None else base
+        self.changed: dict[str, str] = {}
+        self.dropped: set[str] = set()
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self.changed[key]
+
+        except KeyError:
+            if key in self.dropped:
+                raise
+            return self.base[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: str):
+        self.changed[key] = value
+        self.dropped.discard(key)
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+
+        self.changed.pop(key, None)
+
+        if key in self.base:
+            self.dropped.add(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.changed or (key not in self.dropped and key in self.base)
+
+    def __iter__(self) -> Iterator[str]:
+        changed = self.changed
+        dropped = self.dropped
+
+        yield from changed
+
+        for key in self.base:
+            if key not in changed and key not in dropped:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def export(self):
+        """Pushes in-memory changes into the underlying mapping."""
+        base = self.base
+
+        for key in self.dropped:
+            base.pop(key, None)
+
+        base.update(self.changed)
+
+        self.changed.clear()
+        self.dropped.clear()
+
+
+class FrozenEnviron(Mapping):
+    """Immutable snapshot of environment variables.
+
+    Backed by a plain dictionary of already decoded strings,
+    so reads cost a dict lookup and are safe to be done from many threads.
+
+    """
+    __slots__ = ('_data', 'get')
+
+    def __init__(self, data: Mapping):
+        """
+        :param data: Environment variables to take a snapshot of.
+
+        """
+        self._data = dict(data)
+        self.get = self._data.get
+
+    def __getitem__(self, key: str) -> str:
+        return self._data[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Frozen environment is read-only')
+
+    __setitem__ = __delitem__ = setdefault = pop = _read_only
+
+
+def _get_known_attrs(cls: type) -> frozenset[str]:
+    # Attributes defined or annotated in the class or its bases.
+    attrs = set(dir(cls))
+
+    for klass in cls.__mro__:
+        attrs.update(getattr(klass, '__annotations__', ()))
+
+    return frozenset(attrs)
+
 
 class Environment:
+    """Environment type.
+
+    Environment variables are available as uppercase attributes:
+
+    ```python
+    env.HOME  # the same as env.get('HOME')
+    env.MY_VAR = 1  # the same as env.set('MY_VAR', 1)
+    ```
+
+    Setting or getting other unknown attributes raises AttributeError.
+    Subclasses should declare their own attributes in class body
+    (with annotations or default values):
+
+    ```python
+    class MyEnvironment(Environment):
+
+        extra: int
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.extra = 1
+    ```
+
+    """
 
     name: str = 'dummy'
     """Name this environment type is known as."""
@@ -20,6 +176,12 @@ class Environment:
     aliases: ClassVar[list[str]] = []
     """Aliases this environment type is known as."""
 
+    names: ClassVar[frozenset[str]] = frozenset()
+    """Name and aliases (including ones given to `register_type()`)
+    this environment type is known as. Used by `.matches()`.
+
+    """
+
     type_cast: bool = False
     """Whether to cast values into Python natives in .get() and .getmany() by default."""
 
@@ -35,9 +197,56 @@ class Environment:
     is_production: bool = False
     """Indicates whether this environment is production."""
 
-    env = os.environ
+    prefix_index: bool = False
+    """Whether to maintain sorted keys index to speed up prefix lookups
+    in .getmany() and .dropmany().
+
+    !!! note
+        Index is kept in sync by .set(), .setmany(), .drop() and .dropmany().
+        Use .reindex() if environment is changed bypassing this object.
+
+    """
+
+    envfiles_snapshot: str = ''
+    """Path to a file to persist parsed .env files snapshot into.
+    If not set, snapshot is kept in memory.
 
-    def __init__(self, name: str = '', *, type_cast: bool | None = None):
+    Unchanged .env files (judging by modification time and size) are not parsed again.
+
+    !!! warning
+        Use a private directory (not a shared one like /tmp) for the snapshot file.
+
+    """
+
+    envfiles_roots: ClassVar[list[str]] = []
+    """Directories to search .env files in (files from later directories override earlier ones).
+    If not set, current working directory is used.
+
+    """
+
+    envfiles: tuple[str, ...] = ()
+    """Paths of .env files actually used by the last .update_from_envfiles() call."""
+
+    env: MutableMapping = os.environ
+    """Environment variables storage. Default: `os.environ`. See also `OverlayEnviron`."""
+
+    _attrs: ClassVar[frozenset[str]] = frozenset()
+    """Attributes known to the type: defined or annotated in class body (set by `__init_subclass__()`).
+    Assigning other attributes sets environment variables (uppercase names) or raises AttributeError.
+
+    """
+
+    _index: list[str] | None = None
+    _envfiles_applied: dict[str, str] | None = None
+
+    def __init__(
+            self,
+            name: str = '',
+            *,
+            type_cast: bool | None = None,
+            prefix_index: bool | None = None,
+            env: MutableMapping | None = None,
+    ):
         """
         :param name: Environment name.
             !!! note
@@ -47,11 +256,155 @@ class Environment:
             !!! note
                 This will prevail over class attribute.
 
+        :param prefix_index: Whether to maintain sorted keys index to speed up prefix lookups.
+            !!! note
+                This will prevail over class attribute.
+
+        :param env: Environment variables storage (e.g. `OverlayEnviron`).
+            !!! note
+                This will prevail over class attribute.
+
         """
-        self.name = name or self.name
+        self._index = None
+        self._envfiles_applied = None
+
+        self.name = sys.intern(name) if name else self.name
         self.type_cast = type_cast or self.type_cast
+        self.prefix_index = prefix_index or self.prefix_index
+
+        if env is not None:
+            self.env = env
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.names = frozenset(sys.intern(name) for name in (cls.name, *cls.aliases))
+        cls._attrs = _get_known_attrs(cls)
+
+    def matches(self, name: 'str | Environment') -> bool:
+        """Returns True if the given name (or environment object name)
+        is this environment name or is one of this environment type names (see `names`).
+
+        ```python
+        Production().matches('prod')  # True
+        Production() == 'prod'  # False
+        ```
+
+        :param name:
+
+        """
+        if isinstance(name, Environment):
+            name = name.name
+
+        return name == self.name or name in self.names
+
+    def freeze(self) -> 'Environment':
+        """Returns a copy of this object backed by an immutable snapshot
+        of current environment variables (see `FrozenEnviron`).
+
+        Snapshot could be shared between threads for fast lock-free reads.
+
+        """
+        frozen = type(self)(self.name, type_cast=self.type_cast, prefix_index=True, env=FrozenEnviron(self.env))
+        frozen.envfiles = self.envfiles
+
+        return frozen
 
-    def update_from_envfiles(self):
+    def export(self):
+        """Pushes environment variables changes kept in memory (see `OverlayEnviron`)
+        into the OS environment. Does nothing for other storages.
+
+        """
+        export = getattr(self.env, 'export', None)
+
+        if export is not None:
+            export()
+
+    def reindex(self):
+        """Drops keys index (if any). It'll be rebuilt on the next prefix lookup."""
+        self._index = None
+
+    def _index_add(self, key: str):
+        index = self._index
+
+        if index is not None and key not in self.env:
+            insort(index, key)
+
+    def _index_drop(self, key: str):
+        index = self._index
+
+        if index is not None:
+            idx = bisect_left(index, key)
+
+            if idx < len(index) and index[idx] == key:
+                del index[idx]
+
+    def _iter_prefixed(self, prefix: str) -> Iterator[tuple[str, str]]:
+        env = self.env
+
+        if not self.prefix_index:
+
+            for key, val in env.items():
+                if key.startswith(prefix):
+                    yield key, val
+
+            return
+
+        index = self._index
+
+        if index is None:
+            index = self._index = sorted(env)
+
+        for key in islice(index, bisect_left(index, prefix), None):
+
+            if not key.startswith(prefix):
+                break
+
+            val = env.get(key)
+
+            if val is not None:
+                yield key, val
+
+    def get_envfiles(self) -> list[str]:
+        """Returns paths of existing .env files to be used by .update_from_envfiles()
+        in the order they are read.
+
+        Every search directory is listed only once, so missing files cost nothing.
+
+        """
+        name_candidates = [self.name]
+        name_candidates.extend(self.aliases)
+
+        def contribute_candidates(tpl):
+            # This will handle env type aliases.
+            names.extend(tpl % candidate for candidate in name_candidates)
+
+        names = ['.env']
+        contribute_candidates('.env.%s')
+        names.append('.env.local')
+        contribute_candidates('.env.%s.local')
+        names = list(dict.fromkeys(names))
+
+        files = []
+
+        for root in self.envfiles_roots or ['']:
+
+            try:
+                with os.scandir(root or '.') as entries:
+                    existing = {entry.name for entry in entries if entry.name.startswith('.env') and entry.is_file()}
+
+            except OSError:
+                continue
+
+            files.extend(f'{Path(root) / name}' for name in names if name in existing)
+
+        return files
+
+    def update_from_envfiles(
+            self,
+            *,
+            prefix: str = '',
+            keys: Iterable[str] | None = None,
+    ) -> dict[str, tuple[str | None, str | None]]:
         """Updates environment variables (if not already set) using data from .env files.
 
         Files used (as they read; values read later override previous values):
@@ -62,25 +415,161 @@ class Environment:
 
             <env_name> - Environment name (e.g. ``production``, ``development`` etc.)
 
+        ${VAL} templates are expanded after all files are merged, so they may reference
+        variables defined later or in files read later (see `expand_vars()`).
+        Variables set by other means take precedence. ValueError is raised on circular references.
+
+        Files are searched in `envfiles_roots` directories (current working directory by default).
+        Paths of files used are available in `envfiles` attribute.
+
+        On subsequent calls variables set from .env files earlier are updated
+        if files are changed. Returns changes dictionary: variable names
+        to (old value, new value) tuples, where `None` stands for an absent value.
+
+        :param prefix: Only load variables with names starting with this prefix.
+            Other entries are skipped while parsing, so they are not available for ${VAL} templates
+            unless already set in environment.
+
+        :param keys: Only load these variables (in addition to prefixed ones if `prefix` is set).
+
         """
-        name_candidates = [self.name]
-        name_candidates.extend(self.aliases)
+        if keys is not None:
+            # used for every file
+            keys = frozenset(keys)
 
-        def contribute_candidates(tpl):
-            # This will handle env type aliases.
-            for candidate in name_candidates:
-                files.append(tpl % candidate)  # noqa: PERF401
+        with measure('envfiles.resolve'):
+            files = self.get_envfiles()
 
-        files = ['.env']
-        contribute_candidates('.env.%s')
-        files.append('.env.local')
-        contribute_candidates('.env.%s.local')
+        snapshot = get_snapshot(self.envfiles_snapshot)
+        tokenized = [snapshot.tokenize(fname, prefix=prefix, include=keys) for fname in files]
+        snapshot.save()
+
+        return self._apply_envfiles(files, tokenized, accept=_get_key_filter(prefix, keys))
+
+    async def aupdate_from_envfiles(
+            self,
+            *,
+            prefix: str = '',
+            keys: Iterable[str] | None = None,
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Asynchronous version of .update_from_envfiles().
+
+        Files are looked up and read in threads, all files are read concurrently.
+
+        """
+        import asyncio  # noqa: PLC0415
+
+        if keys is not None:
+            keys = frozenset(keys)
+
+        files = await asyncio.to_thread(self.get_envfiles)
+
+        snapshot = get_snapshot(self.envfiles_snapshot)
+        tokenized = await asyncio.gather(*(
+            asyncio.to_thread(snapshot.tokenize, fname, prefix=prefix, include=keys) for fname in files
+        ))
+        await asyncio.to_thread(snapshot.save)
+
+        return self._apply_envfiles(files, tokenized, accept=_get_key_filter(prefix, keys))
+
+    def _apply_envfiles(
+            self,
+            files: list[str],
+            tokenized: Sequence[Sequence[tuple[str, str]]],
+            *,
+            accept: Callable[[str], bool] | None = None,
+    ) -> dict[str, tuple[str | None, str | None]]:
         env_vars = {}
 
-        for fname in files:
-            env_vars.update(read_envfile(fname))
+        for pairs in tokenized:
+            env_vars.update(pairs)
+
+        self.envfiles = tuple(files)
+
+        # Only variables not set by other means are touched.
+        env = self.env
+        applied = self._envfiles_applied or {}
+        diff = {}
 
-        self.setmany(env_vars, overwrite=False)
+        def get_external(name: str) -> str | None:
+            # Templates use values set by other means, otherwise values from files.
+            val = env.get(name)
+            if val is not None and name in env_vars and applied.get(name) == val:
+                # set from files earlier, to be updated
+                return None
+            return val
+
+        env_vars = expand_vars(env_vars, get_external)
+
+        for key, val in env_vars.items():
+            val_applied = applied.get(key)
+
+            if val_applied is None:
+                if key not in env:
+                    diff[key] = (None, val)
+
+            elif val_applied != val and env.get(key) == val_applied:
+                diff[key] = (val_applied, val)
+
+        for key, val_applied in applied.items():
+            if accept is not None and not accept(key):
+                # not loaded this time, so not known to be removed
+                continue
+
+            if key not in env_vars and env.get(key) == val_applied:
+                diff[key] = (val_applied, None)
+
+        for key, (_, val) in diff.items():
+            if val is None:
+                self.drop(key)
+                del applied[key]
+
+            else:
+                self.set(key, val)
+                applied[key] = val
+
+        self._envfiles_applied = applied
+
+        return diff
+
+    def watch_envfiles(
+            self,
+            *,
+            interval: float = 1.0,
+            prefix: str = '',
+            keys: Iterable[str] | None = None,
+            on_change: Callable[[dict], None] | None = None,
+            start: bool = True,
+    ) -> 'EnvfilesWatcher':
+        """Returns a watcher polling .env files for changes (see `EnvfilesWatcher`).
+
+        Changed values are applied to this environment
+        (only for variables set from .env files earlier).
+
+        :param interval: Polling interval in seconds.
+
+        :param prefix: Only apply variables with names starting with this prefix.
+
+        :param keys: Only apply these variables (in addition to prefixed ones if `prefix` is set).
+
+        :param on_change: Callable to be called with changes dictionary:
+            variable names to (old value, new value) tuples.
+            `None` stands for an absent value.
+
+        :param start: Whether to start polling in a background thread.
+
+        """
+        from .watcher import EnvfilesWatcher  # noqa: PLC0415
+
+        watcher = EnvfilesWatcher(self, interval=interval, prefix=prefix, keys=keys)
+
+        if on_change is not None:
+            watcher.callbacks.append(on_change)
+
+        if start:
+            watcher.start()
+
+        return watcher
 
     def getmany(self, prefix: str = '', *, type_cast: bool | None = None) -> dict:
         """Returns a dictionary of values for keys the given prefix.
@@ -94,14 +583,84 @@ class Environment:
             type_cast = self.type_cast
 
         result = {}
+        prefix_len = len(prefix)
+
+        for key, val in self._iter_prefixed(prefix):
+
+            if type_cast:
+                val = cast_type(val)
+
+            result[key[prefix_len:]] = val
+
+        return result
+
+    def gettree(
+            self,
+            prefix: str = '',
+            *,
+            sep: str = '__',
+            types: Mapping[str, type] | None = None,
+            type_cast: bool | None = None,
+    ) -> dict:
+        """Returns a nested dictionary of values for keys with the given prefix.
+        Keys are split into levels by the separator.
+
+        ```python
+        # APP_DB__HOST=localhost
+        # APP_DB__PORT=5432
+        # APP_DEBUG=1
+        env.gettree('APP_', types={'DB__PORT': int})
+        # {'DB': {'HOST': 'localhost', 'PORT': 5432}, 'DEBUG': '1'}
+        ```
+
+        Raises ValueError if a key is both a value and a level (e.g. `APP_DB` and `APP_DB__HOST`).
+
+        :param prefix:
+
+        :param sep: Levels separator.
+
+        :param types: Keys (without prefix) to types mapping. Values are casted into these types
+            regardless of `type_cast` (see `cast_type()`). Types without known converters
+            (e.g. list, dict) are literal-evaluated.
+
+        :param type_cast: Try to cast values (for keys without `types`) into Python native types.
+
+        """
+        if type_cast is None:
+            type_cast = self.type_cast
+
+        get_type = (types or {}).get
+
+        result = {}
+        branches = {id(result)}  # leaf values may be dicts too
+        prefix_len = len(prefix)
+
+        for key, val in self._iter_prefixed(prefix):
+            key = key[prefix_len:]
+            *path, leaf = key.split(sep)
+            node = result
+
+            for part in path:
+                child = node.get(part, _UNSET)
+
+                if child is _UNSET:
+                    child = node[part] = {}
+                    branches.add(id(child))
+
+                elif id(child) not in branches:
+                    raise ValueError(f'{prefix}{key} conflicts with {prefix}{part} value')
+
+                node = child
 
-        for key, val in self.env.items():
-            if key.startswith(prefix):
+            if leaf in node:
+                raise ValueError(f'{prefix}{key} conflicts with {prefix}{key}{sep}* values')
 
-                if type_cast:
-                    val = cast_type(val)
+            type_ = get_type(key)
 
-                result[key.replace(prefix, '', 1)] = val
+            if type_ is not None or type_cast:
+                val = cast_type(val, type_)
+
+            node[leaf] = val
 
         return result
 
@@ -126,6 +685,8 @@ class Environment:
             key = f'{prefix}{key}'
             val = f'{val}'
 
+            self._index_add(key)
+
             if overwrite:
                 env[key] = val
 
@@ -141,11 +702,14 @@ class Environment:
 
         """
         env = self.env
+        prefix_len = len(prefix)
 
-        keys = keys or [key.replace(prefix, '', 1) for key in env.keys() if key.startswith(prefix)]
+        keys = keys or [key[prefix_len:] for key, _ in self._iter_prefixed(prefix)]
 
         for key in keys:
-            del env[f'{prefix}{key}']
+            key = f'{prefix}{key}'
+            del env[key]
+            self._index_drop(key)
 
     def get(self, key: str, default: Any = None, *, type_cast: bool | None = None) -> Any:
         """Get environment variable value.
@@ -171,6 +735,71 @@ class Environment:
         """The same as `get` but tries to cast values into Python natives."""
         return self.get(key, default=default, type_cast=True)
 
+    def get_batch(
+            self,
+            keys: Iterable[str],
+            *,
+            defaults: Mapping[str, Any] | None = None,
+            types: Mapping[str, type] | None = None,
+            type_cast: bool | None = None,
+    ) -> dict:
+        """Returns a dictionary of values for the given keys.
+
+        The same as calling `.get()` for every key, but faster.
+        Equal values of the same type are casted only once.
+
+        ```python
+        env.get_batch(['HOST', 'PORT', 'DEBUG'], defaults={'PORT': 80}, types={'PORT': int, 'DEBUG': bool})
+        ```
+
+        :param keys:
+
+        :param defaults: Keys to default values mapping.
+            Values for keys without defaults default to `None`.
+
+        :param types: Keys to types mapping. Values are casted into these types
+            regardless of `type_cast` (see `cast_type()`). Types without known converters
+            (e.g. list, dict) are literal-evaluated.
+
+        :param type_cast: Try to cast values (for keys without `types`) into Python native types.
+
+        """
+        if type_cast is None:
+            type_cast = self.type_cast
+
+        get = self.env.get
+        get_default = (defaults or {}).get
+        get_type = (types or {}).get
+
+        casted = {}
+        result = {}
+
+        for key in keys:
+            val = get(key)
+
+            if val is None:
+                result[key] = get_default(key)
+                continue
+
+            type_ = get_type(key)
+
+            if type_ is not None or type_cast:
+                cache_key = (val, type_)
+                val_casted = casted.get(cache_key, casted)
+
+                if val_casted is casted:
+                    val_casted = cast_type(val, type_)
+
+                    if not isinstance(val_casted, _MUTABLE):
+                        # mutable values are not shared between keys
+                        casted[cache_key] = val_casted
+
+                val = val_casted
+
+            result[key] = val
+
+        return result
+
     def set(self, key: str, value: Any, *, overwrite: bool = True):
         """Set environment variable.
 
@@ -183,6 +812,8 @@ class Environment:
         """
         value = f'{value}'
 
+        self._index_add(key)
+
         if overwrite:
             self.env[key] = value
 
@@ -192,25 +823,56 @@ class Environment:
     def drop(self, key: str):
         """Removes key from environment."""
         del self.env[key]
-        
+        self._index_drop(key)
+
     def keys(self):
         # mapping protocol: allow casting to a dict
         return list(self.env.keys())
 
-    __delattr__ = __delitem__ = drop
-    __getattr__ = __getitem__ = get
+    __delitem__ = drop
+    __getitem__ = get
     __setitem__ = set
 
-    def __setattr__(self, key, value):
+    def _no_attr(self, key: str):
+        raise AttributeError(
+            f'{type(self).__name__!r} object has no attribute {key!r}. '
+            'Only uppercase names are regarded as environment variables, '
+            'other attributes should be declared in class body.')
 
-        try:
-            self.__getattribute__(key)
+    def __getattr__(self, key: str) -> Any:
+        # Called only if there's no such attribute. Inlined .get() for speed.
+        if key.isupper():
+            value = self.env.get(key)
+
+            if value is not None and self.type_cast:
+                value = cast_type(value)
 
+            return value
+
+        self._no_attr(key)
+
+    def __setattr__(self, key: str, value: Any):
+
+        if key in self._attrs:
             object.__setattr__(self, key, value)
 
-        except AttributeError:
+        elif key.isupper():
             self.set(key, value)
 
+        else:
+            self._no_attr(key)
+
+    def __delattr__(self, key: str):
+
+        if key in self._attrs:
+            object.__delattr__(self, key)
+
+        elif key.isupper():
+            self.drop(key)
+
+        else:
+            self._no_attr(key)
+
     def __contains__(self, key):
         return key in self.env
 
@@ -218,7 +880,21 @@ class Environment:
         return self.name
 
     def __eq__(self, other):
-        return f'{self}' == f'{other}'
+        # Names only, consistent with hash (see .matches() for alias-aware comparison).
+        if isinstance(other, Environment):
+            other = other.name
+
+        elif not isinstance(other, str):
+            return NotImplemented
+
+        return other == self.name
+
+    def __hash__(self):
+        # The same as for the name: {'production': ...}[Production()]
+        return hash(self.name)
+
+
+Environment._attrs = _get_known_attrs(Environment)
 
 
 class Development(Environment):
@@ -268,9 +944,10 @@ def register_type(env_type: TypeEnvArg, alias: str = '') -> type[Environment]:
     if isinstance(env_type, str):
         env_type = TYPES[env_type]
 
-    alias = alias or env_type.name
+    alias = sys.intern(alias or env_type.name)
 
     TYPES[alias] = env_type
+    env_type.names |= {alias}
 
     for alias in env_type.aliases:
         TYPES[alias] = env_type
@@ -0,0 +1,113 @@
+import pickle
+from collections.abc import Iterable, MutableMapping
+
+from .base import _CACHE, _get_cache_key, get_environment
+from .envs import DEVELOPMENT, Environment
+from .settings import _SCOPE, SettingsBase
+
+VERSION = 1
+"""Payload format version."""
+
+
+def dump(
+        env: Environment | None = None,
+        *,
+        settings: Iterable[SettingsBase | type[SettingsBase]] = (),
+) -> bytes:
+    """Returns a payload with resolved environment and settings
+    to be passed to child processes (see `load()`).
+
+    Payload contains environment type, variables set from .env files
+    and casted values of settings (for settings having environment values).
+
+    ```python
+    payload = dump(settings=[Settings])
+
+    # spawned processes
+    with multiprocessing.get_context('spawn').Pool(initializer=load, initargs=(payload,)) as pool:
+        ...
+
+    # forked processes (e.g. gunicorn `post_fork` hook)
+    load(payload)
+    ```
+
+    !!! note
+        Settings classes, environment type and settings values should be picklable.
+
+    :param env: Environment object. If not set, cached environment is used (see `get_environment()`).
+
+    :param settings: Settings objects or classes to hand off casted values for.
+
+    """
+    if env is None:
+        env = get_environment(cached=True)
+
+    settings_values = []
+
+    for settings_obj in settings:
+        settings_cls = settings_obj if isinstance(settings_obj, type) else type(settings_obj)
+        values = {}
+
+        for name, setting in settings_cls._settings.items():
+            value_raw = env.get(name, type_cast=False)
+
+            if value_raw is not None:
+                values[name] = (value_raw, setting.cast(value_raw))
+
+        settings_values.append((settings_cls, values))
+
+    state = (
+        type(env),
+        env.name,
+        env.type_cast,
+        env.prefix_index,
+        env.envfiles,
+        env._envfiles_applied or {},
+    )
+
+    return pickle.dumps((VERSION, state, settings_values), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load(payload: bytes, *, env: MutableMapping | None = None) -> Environment:
+    """Adopts environment and settings from a payload made by `dump()`.
+    Returns environment object.
+
+    .env files are not read: variables from the payload are set
+    (if not already set by other means). Detectors are not probed.
+    Environment object is cached to be returned by `get_environment(cached=True)`
+    (also used by settings) called without detection arguments.
+
+    Session values (including overrides) of settings for the current context are dropped,
+    so values set in a parent process before fork are not reused.
+
+    !!! warning
+        Payload is unpickled: load only payloads made by your own processes.
+
+    :param payload:
+
+    :param env: Environment variables storage to be used instead of `os.environ`.
+
+    """
+    version, state, settings_values = pickle.loads(payload)
+
+    if version != VERSION:
+        raise ValueError(f'Unsupported envbox payload version: {version}')
+
+    env_cls, name, type_cast, prefix_index, envfiles, applied = state
+
+    env_obj = env_cls(name, type_cast=type_cast, prefix_index=prefix_index, env=env)
+    env_obj.envfiles = envfiles
+    env_obj.setmany(applied, overwrite=False)
+    env_obj._envfiles_applied = dict(applied)
+
+    _CACHE[_get_cache_key(DEVELOPMENT, None, None, True, env)] = env_obj  # noqa: FBT003
+
+    for settings_cls, values in settings_values:
+        settings = settings_cls._settings
+
+        for setting_name, cached in values.items():
+            settings[setting_name]._cached = cached
+
+    _SCOPE.set(())
+
+    return env_obj
@@ -1,59 +1,182 @@
-from threading import local
-from typing import TYPE_CHECKING, Any, Optional
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
 from .base import get_environment
+from .utils import _MUTABLE, TYPE_CASTERS, cast_type
 
 if TYPE_CHECKING:
     from .envs import Environment
 
 
-_LOCALS = local()
-_UNSET = ()
+_UNSET = object()
 
-_LOCALS.envbox_settings = {}
+_SCOPE: ContextVar[tuple[dict, ...]] = ContextVar('envbox_settings', default=())
+"""Session values layers (innermost first) for the current context (thread or asyncio task).
+Layers are never modified in place, so contexts copied from each other do not interfere.
+
+"""
+
+
+def _get_session_value(name: str) -> Any:
+
+    for layer in _SCOPE.get():
+        value = layer.get(name, _UNSET)
+
+        if value is not _UNSET:
+            return value
+
+    return _UNSET
+
+
+def _set_session_value(name: str, value: Any):
+    # Copy-on-write for the innermost layer only.
+    layers = _SCOPE.get()
+
+    if layers:
+        top, *layers = layers
+        top = {**top, name: value}
+
+    else:
+        top = {name: value}
+
+    _SCOPE.set((top, *layers))
+
+
+_TYPES_BY_NAME = {type_.__name__: type_ for type_ in TYPE_CASTERS}
+
+
+def _get_setting_type(annotation: Any, default: Any) -> type | None:
+    # Annotation prevails over the type of default value.
+    # Only types with known converters are used, other values are literal-evaluated.
+    if annotation is not None:
+
+        if isinstance(annotation, str):
+            annotation = _TYPES_BY_NAME.get(annotation)
+
+        return annotation if annotation in TYPE_CASTERS else None
+
+    type_ = type(default)
+
+    if type_ in TYPE_CASTERS:
+        return type_
+
+    return None
 
 
 class _SettingsMeta(type):
 
     def __new__(cls, name, bases, namespace, **kwargs):
 
+        settings_cls = type.__new__(cls, name, bases, dict(namespace))
+
+        # Taken from the class since annotations may be evaluated lazily (PEP 649).
+        annotations = settings_cls.__annotations__
+
         for attr_name, attr_val in namespace.items():
             if attr_name == attr_name.upper():
-                namespace[attr_name] = _Setting(attr_name, default=attr_val)
+                setattr(settings_cls, attr_name, _Setting(
+                    attr_name,
+                    default=attr_val,
+                    type_=_get_setting_type(annotations.get(attr_name), attr_val),
+                ))
+
+        settings = {}
 
-        return type.__new__(cls, name, bases, dict(namespace))
+        for base in reversed(settings_cls.__mro__):
+            settings.update((key, val) for key, val in vars(base).items() if isinstance(val, _Setting))
+
+        settings_cls._settings = settings
+
+        return settings_cls
 
 
 class _Setting:
 
-    def __init__(self, name: str, *, default: Any):
+    def __init__(self, name: str, *, default: Any, type_: type | None = None):
         self.name = name
         self.default = default
+        self.type = type_
+        self._cached = (None, default)  # raw env value, casted value
 
     def __get__(self, instance: 'SettingsBase', owner):
 
-        try:
-            return _LOCALS.envbox_settings[self.name]
+        if instance is None:
+            return self
+
+        value = _get_session_value(self.name)
+
+        if value is not _UNSET:
+            return value
+
+        env = instance.get_environment()
+        if not env:
+            return self.default
+
+        value_raw = env.get(self.name, type_cast=False)
+        if value_raw is None:
+            return self.default
+
+        return self.cast(value_raw)
+
+    def cast(self, value_raw: str) -> Any:
+        """Casts environment value into setting type.
+        Memoized until environment value is changed.
+        Mutable values are returned as copies.
+
+        :param value_raw:
+
+        """
+        cached_raw, value = self._cached
+
+        if value_raw != cached_raw:
+            value = cast_type(value_raw, self.type)
+            self._cached = (value_raw, value)
 
-        except KeyError:
-            env = instance.get_environment()
-            if not env:
-                return self.default
-            return env.get_casted(self.name, default=self.default)
+        if isinstance(value, _MUTABLE):
+            # protect memoized value from modifications
+            from copy import deepcopy  # noqa: PLC0415
+
+            value = deepcopy(value)
+
+        return value
 
     def __set__(self, instance, value):
-        _LOCALS.envbox_settings[self.name] = value
+        _set_session_value(self.name, value)
+
+
+class _SnapshotBase:
+    # Base for settings snapshot classes. Heirs define slots for settings.
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({values})'
 
 
 class SettingsBase(metaclass=_SettingsMeta):
     """Use this class as base for your classes containing settings.
 
     !!! note
-        Settings are per-thread.
+        Settings are per-context: values set in a thread or in an asyncio task
+        are not visible from other threads and tasks.
 
     Every uppercase attribute of an heir class will be treated
     as a setting.
 
+    Environment values are casted into the type of setting annotation
+    or, if not annotated, into the type of default value
+    (for `bool`, `int`, `float` and `str` defaults). Casted values
+    are memoized until environment value is changed.
+
     Accessing any setting which was not set in the session,
     will lead to appropriate environment variable probing, thus:
 
@@ -67,19 +190,101 @@ class SettingsBase(metaclass=_SettingsMeta):
         ONE = 1
         SOME = 'two'
         ANOTHER = True
+        TIMEOUT: float = 5
 
     Settings = _Settings()
 
     if Settings.ANOTHER:
         Settings.SOME = 'three'
+
+    with Settings.override(ONE=2):
+        ...
     ```
 
     """
+    _settings: ClassVar[dict[str, _Setting]]
+    """Settings declared by the class and its bases (set by metaclass)."""
+
+    _snapshot_cls: ClassVar[type[_SnapshotBase] | None] = None
+
+    def snapshot(self) -> Any:
+        """Resolves all settings at once and returns a read-only object
+        with plain (slotted) attributes for every setting.
+
+        Environment is resolved once and every value is casted once
+        (casting is shared with settings access and memoized).
+        Session values (including overrides) are respected.
+
+        Snapshot is not updated on changes: take a new one when required.
+
+        ```python
+        settings = Settings.snapshot()
+
+        for _ in range(1000):
+            if settings.ANOTHER:
+                ...
+        ```
+
+        """
+        cls = type(self)
+        snapshot_cls = cls.__dict__.get('_snapshot_cls')
+
+        if snapshot_cls is None:
+            settings = cls._settings
+            snapshot_cls = cls._snapshot_cls = type(f'{cls.__name__}Snapshot', (_SnapshotBase,), {
+                '__slots__': tuple(settings),
+            })
+
+        env = self.get_environment()
+
+        snapshot = object.__new__(snapshot_cls)
+        set_value = object.__setattr__
+
+        for name, setting in cls._settings.items():
+            value = _get_session_value(name)
+
+            if value is _UNSET:
+                value_raw = env.get(name, type_cast=False) if env else None
+                value = setting.default if value_raw is None else setting.cast(value_raw)
+
+            set_value(snapshot, name, value)
+
+        return snapshot
+
+    @contextmanager
+    def override(self, **values: Any) -> Iterator['SettingsBase']:
+        """Overrides settings within the context.
+        Overrides are visible only to the current thread or asyncio task
+        (and tasks created from it).
+
+        ```python
+        with Settings.override(ONE=2, SOME='other'):
+            ...
+        ```
+
+        :param values: Setting names mapped to values.
+
+        """
+        for name in values:
+            if name not in self._settings:
+                raise AttributeError(f'{name!r} is not a setting of {type(self).__name__}')
+
+        token = _SCOPE.set((values, *_SCOPE.get()))
+
+        try:
+            yield self
+
+        finally:
+            _SCOPE.reset(token)
 
     def get_environment(self) -> Optional['Environment']:
         """Return current environment.
 
         This could be customized by a child if required.
 
+        !!! note
+            Environment is resolved once per process and cached.
+            Use `envbox.invalidate()` to force a new resolution.
+
         """
-        return get_environment()
+        return get_environment(cached=True)
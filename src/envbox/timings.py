@@ -0,0 +1,113 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+COLLECTORS: list['Timings'] = []
+"""Active timings collectors. Every recorded event goes into each of them."""
+
+
+class Timings:
+    """Per-phase timings and counts report.
+
+    Phases:
+        * detect.<detector_name> - environment detector probe;
+        * detect.<detector_name>.timeout - detector probe timed out (see `DetectorsChain`);
+        * envfiles.resolve - looking up .env files;
+        * envfile.open - .env file open;
+        * envfile.tokenize - .env file read and tokenization;
+        * envfile.expand - ${VAR} templates expansion;
+        * cast - values casting;
+        * cache.<cache_name>.hit|miss - cache hits and misses (`environment`, `envfile`, `cast`, `probe`).
+
+    """
+
+    def __init__(self):
+        self.phases: dict[str, list] = {}
+        """Phase name to [count, total seconds] mapping."""
+
+    def add(self, phase: str, seconds: float = 0.0):
+        """Adds an event for the given phase.
+
+        :param phase:
+
+        :param seconds: Time spent.
+
+        """
+        stats = self.phases.get(phase)
+
+        if stats is None:
+            stats = self.phases[phase] = [0, 0.0]
+
+        stats[0] += 1
+        stats[1] += seconds
+
+    def get_count(self, phase: str) -> int:
+        """Returns number of events for the given phase."""
+        return self.phases.get(phase, (0, 0.0))[0]
+
+    def get_seconds(self, phase: str) -> float:
+        """Returns total time spent in the given phase."""
+        return self.phases.get(phase, (0, 0.0))[1]
+
+    def __str__(self):
+        return '\n'.join(
+            f'{phase:<30} {count:>8} {seconds * 1000:>12.3f} ms'
+            for phase, (count, seconds) in sorted(self.phases.items())
+        )
+
+
+def record(phase: str, seconds: float = 0.0):
+    """Records an event for the given phase into active collectors.
+
+    :param phase:
+
+    :param seconds: Time spent.
+
+    """
+    for collector in COLLECTORS:
+        collector.add(phase, seconds)
+
+
+class measure:
+    """Context manager recording time spent in a block
+    if there are active collectors.
+
+    :param phase:
+
+    """
+    __slots__ = ('phase', 'started')
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.started = 0.0
+
+    def __enter__(self):
+        if COLLECTORS:
+            self.started = perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.started:
+            record(self.phase, perf_counter() - self.started)
+
+
+@contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """Collects timings of environment resolution phases
+    happened within the context (in any thread).
+
+    ```python
+    with collect_timings() as timings:
+        get_environment()
+
+    print(timings)
+    ```
+
+    """
+    timings = Timings()
+    COLLECTORS.append(timings)
+
+    try:
+        yield timings
+
+    finally:
+        COLLECTORS.remove(timings)
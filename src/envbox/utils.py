@@ -1,32 +1,483 @@
+import marshal
 import os
-import re
-from ast import literal_eval
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, AnyStr, NamedTuple
 
-RE_TPL_VAR = re.compile(r'(\${([^}]+)})')
+from .timings import COLLECTORS, measure, record
 
 
-def cast_type(value: str) -> Any:
-    """Try to cast value into Python native type.
+@cache
+def _get_re_tpl_var():
+    # Compiled on first use to keep import cheap.
+    import re  # noqa: PLC0415
+
+    return re.compile(r'(\${([^}]+)})')
+
+
+def __getattr__(name: str):
+    # Lazy module attributes.
+    if name == 'RE_TPL_VAR':
+        return _get_re_tpl_var()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+BOOL_TRUE = {'1', 'true', 'yes', 'on', 'y'}
+BOOL_FALSE = {'0', 'false', 'no', 'off', 'n', ''}
 
-    Returns non casted on errors.
+
+def cast_bool(value: str) -> bool:
+    """Casts string into boolean.
+
+    Raises ValueError for unknown values.
 
     :param value:
 
     """
-    result = value
+    probe = value.strip().lower()
+
+    if probe in BOOL_TRUE:
+        return True
+
+    if probe in BOOL_FALSE:
+        return False
+
+    raise ValueError(f'Unable to cast {value!r} into bool')
+
+
+TYPE_CASTERS: dict[type, Callable[[str], Any]] = {
+    bool: cast_bool,
+    float: float,
+    int: int,
+    str: str,
+}
+"""Direct converters used for known target types by `cast_type()`.
+Other types are called with a value as the only argument.
+
+"""
+
+
+def _literal_eval(value: str) -> Any:
+    from ast import literal_eval  # noqa: PLC0415
 
     try:
-        result = literal_eval(value)
+        return literal_eval(value)
 
     except Exception:  # noqa:BLE001
-        pass
+        return value
+
+
+_KEYWORDS = {'True': True, 'False': False, 'None': None}
+_NUMERIC_CHARS = frozenset('0123456789+-._eE')
+_LITERAL_START = frozenset('[({\'"0123456789+-.')
+_LITERAL_END = frozenset(')]}\'"jJ')
+_MUTABLE = (dict, list, set, tuple)
+
+
+def _cast_literal(value: str) -> Any:
+    # Cheap checks first, literal_eval() only for things looking like literals.
+    probe = value.strip()
+
+    if not probe:
+        return value
+
+    keyword = _KEYWORDS.get(probe, value)
+
+    if keyword is not value:
+        return keyword
+
+    if probe.isascii() and _NUMERIC_CHARS.issuperset(probe):
+        digits = probe[1:] if probe[0] in '+-' else probe
+        digits = digits.replace('_', '')
+
+        try:
+            if digits.isdigit():
+                if digits[0] == '0' and digits.strip('0'):
+                    # leading zeros are not allowed in ints (e.g. zip codes 007)
+                    return value
+                return int(probe)
+
+            return float(probe)
+
+        except ValueError:
+            # e.g. misplaced underscores or --1
+            pass
+
+    elif probe[0] not in _LITERAL_START and probe[-1] not in _LITERAL_END:
+        return value
+
+    return _literal_eval(value)
+
+
+@lru_cache(maxsize=2048)
+def _cast_cached(value: str, type_: type | None) -> Any:
+
+    caster = TYPE_CASTERS.get(type_)
+
+    if caster is not None:
+
+        try:
+            return caster(value)
+
+        except (TypeError, ValueError):
+            # e.g. 80.5 for int
+            pass
+
+    return _cast_literal(value)
+
+
+def cast_type(value: str, type_: type | None = None) -> Any:
+    """Try to cast value into Python native type.
+
+    Returns non casted on errors. Non-string values are returned as is.
+    If value could not be casted into the given type, Python literal evaluation is tried.
+
+    Results are cached, so casting the same string again is cheap.
+
+    :param value:
+
+    :param type_: Target type. For types with known converters (see `TYPE_CASTERS`)
+        a direct converter is used instead of Python literal evaluation.
+        Values for other types (e.g. list, dict) are literal-evaluated.
+
+    """
+    if not isinstance(value, str):
+        # e.g. values set into environment storage programmatically
+        return value
+
+    if COLLECTORS:
+        misses = _cast_cached.cache_info().misses
+
+        with measure('cast'):
+            result = _cast_cached(value, type_)
+
+        record('cache.cast.miss' if _cast_cached.cache_info().misses > misses else 'cache.cast.hit')
+
+    else:
+        result = _cast_cached(value, type_)
+
+    if isinstance(result, _MUTABLE):
+        # protect cached value from modifications
+        from copy import deepcopy  # noqa: PLC0415
+
+        result = deepcopy(result)
 
     return result
 
 
-def read_envfile(fpath: str | Path) -> dict:
+class _Syntax(NamedTuple):
+    # .env syntax tokens for str and bytes tokenization.
+    empty: AnyStr
+    eq: AnyStr
+    hash: AnyStr
+    dquote: AnyStr
+    squote: AnyStr
+    newline: AnyStr
+    newline_escaped: AnyStr
+
+
+_SYNTAX_STR = _Syntax('', '=', '#', '"', "'", '\n', '\\n')
+_SYNTAX_BYTES = _Syntax(b'', b'=', b'#', b'"', b"'", b'\n', b'\\n')
+
+
+def _drop_quotes(quote_char: AnyStr, val: AnyStr, syntax: _Syntax) -> AnyStr:
+    if val.startswith(quote_char) and val.endswith(quote_char):
+        val = val.replace(syntax.newline_escaped, syntax.newline).strip(quote_char)
+    return val
+
+
+def _finalize_value(val: AnyStr, ahead_bag: list[AnyStr], syntax: _Syntax) -> AnyStr:
+
+    if ahead_bag:
+        # normalize into a string with \n
+        if val != syntax.dquote:
+            # do not insert an empty line if there's a single dangling "
+            val += syntax.newline_escaped
+        val += syntax.newline_escaped.join(ahead_bag)
+
+    return _drop_quotes(syntax.squote, _drop_quotes(syntax.dquote, val, syntax), syntax)
+
+
+def _get_key_filter(
+        prefix: AnyStr,
+        include: Iterable[AnyStr] | None,
+) -> Callable[[AnyStr], bool] | None:
+    # Returns a predicate for keys to be accepted or None if every key is accepted.
+    # Keys are accepted if either prefixed or explicitly included.
+    if include is None:
+        if not prefix:
+            return None
+
+        def accept(key: AnyStr) -> bool:
+            return key.startswith(prefix)
+
+        return accept
+
+    include = frozenset(include)
+
+    if not prefix:
+        return include.__contains__
+
+    def accept(key: AnyStr) -> bool:
+        return key in include or key.startswith(prefix)
+
+    return accept
+
+
+def _tokenize(
+        lines: Iterable[AnyStr],
+        syntax: _Syntax,
+        *,
+        accept: Callable[[AnyStr], bool] | None = None,
+) -> Iterator[tuple[AnyStr, AnyStr]]:
+
+    # Syntax tokens are bound to locals: this loop is hot for large files.
+    eq, hash_, dquote, squote = syntax.eq, syntax.hash, syntax.dquote, syntax.squote
+    quotes = (dquote, squote)
+
+    key = val = syntax.empty
+    accepted = True
+    ahead_bag = None  # lines of a multiline value being read
+
+    for line in lines:
+        line = line.strip()
+
+        if ahead_bag is not None:
+            ahead_key, sep, _ = line.partition(eq)
+            ahead_key = ahead_key.strip()
+
+            if not (ahead_key and sep and ahead_key.upper() == ahead_key):
+                if accepted:
+                    ahead_bag.append(line)
+                continue
+
+            # next definition is valid stop here
+            if accepted:
+                yield key, _finalize_value(val, ahead_bag, syntax)
+
+            ahead_bag = None
+
+        if not line or line.startswith(hash_):
+            continue
+
+        key, _, val = line.partition(eq)
+        key = key.strip()
+
+        if not key:
+            continue
+
+        accepted = accept is None or accept(key)
+        val = val.strip()
+
+        if val == dquote or (val.startswith(dquote) and not val.endswith(dquote)):
+            # check ahead whether there is a multiple lines value
+            ahead_bag = []
+            continue
+
+        if accepted:
+            # plain values have nothing to unquote
+            yield key, _finalize_value(val, [], syntax) if val.startswith(quotes) else val
+
+    if ahead_bag is not None and accepted:
+        yield key, _finalize_value(val, ahead_bag, syntax)
+
+
+def iter_envfile(
+        fpath: str | Path,
+        *,
+        prefix: str = '',
+        include: Iterable[str] | None = None,
+        use_mmap: bool = False,
+        encoding: str | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Lazily reads .env key-value file line by line
+    yielding (key, value) pairs as they are parsed.
+
+    Parsing rules are the same as for `read_envfile()`
+    except that ${VAL} templates are left as is.
+
+    Nothing is yielded if file is not accessible.
+
+    :param fpath:
+
+    :param prefix: Only yield keys starting with this prefix.
+
+    :param include: Only yield these keys (in addition to prefixed ones if `prefix` is set).
+
+    :param use_mmap: Memory-map the file and scan its bytes directly.
+        Strings are decoded only for keys and values yielded,
+        which saves memory for large files (especially with `prefix` or `include`).
+        Limitations: only \n and \r\n line endings are supported, only ASCII whitespace
+        is stripped, non-ASCII letters in keys are not recognized as lowercase
+        (e.g. for lines of multiline values).
+
+    :param encoding: File encoding. Default: locale preferred encoding.
+
+    """
+    if use_mmap:
+        yield from _iter_envfile_mmap(fpath, prefix=prefix, include=include, encoding=encoding)
+        return
+
+    try:
+        with measure('envfile.open'):
+            f = Path(fpath).open(encoding=encoding)
+
+    except OSError:
+        return
+
+    with f:
+        yield from _tokenize(f, _SYNTAX_STR, accept=_get_key_filter(prefix, include))
+
+
+def _iter_envfile_mmap(
+        fpath: str | Path,
+        *,
+        prefix: str,
+        include: Iterable[str] | None,
+        encoding: str | None,
+) -> Iterator[tuple[str, str]]:
+    import mmap  # noqa: PLC0415
+
+    if encoding is None:
+        import locale  # noqa: PLC0415
+
+        encoding = locale.getpreferredencoding(False)  # noqa: FBT003
+
+    try:
+        with measure('envfile.open'):
+            f = Path(fpath).open('rb')
+
+    except OSError:
+        return
+
+    with f:
+
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except ValueError:
+            # empty file
+            return
+
+        if include is not None:
+            include = [key.encode(encoding) for key in include]
+
+        accept = _get_key_filter(prefix.encode(encoding), include)
+
+        with buffer:
+            for key, val in _tokenize(iter(buffer.readline, b''), _SYNTAX_BYTES, accept=accept):
+                yield key.decode(encoding), val.decode(encoding)
+
+
+def expand_vars(
+        env_vars: dict[str, str],
+        external: Callable[[str], str | None] | None = None,
+) -> dict[str, str]:
+    """Expands ${VAR} templates in values of the given variables dictionary.
+    Returns a new dictionary.
+
+    Templates may reference variables defined anywhere in the dictionary.
+    Every variable is expanded exactly once, in dependency order,
+    so expansion takes time linear to the overall size of values.
+    Templates referencing unknown variables are left as is,
+    the same for variables referencing themselves (if not defined externally).
+
+    Raises ValueError on circular references between variables.
+
+    :param env_vars: Variables names to unexpanded values mapping.
+
+    :param external: Callable returning a value for a variable name
+        or None if it is not defined externally (e.g. `os.environ.get`).
+        External values are not expanded and take precedence over `env_vars`.
+
+    """
+    split = _get_re_tpl_var().split
+    parsed = {}
+
+    def get_external(name: str) -> str | None:
+        return None
+
+    external = external or get_external
+
+    def parse(val: str) -> list[str]:
+        # Parts are triplets of text, template and variable name, followed by trailing text.
+        parts = split(val)
+        for idx in range(2, len(parts), 3):
+            name = parts[idx]
+            if (val_external := external(name)) is not None:
+                # resolve right away
+                parts[idx - 1] = val_external
+                parts[idx] = ''
+        return parts
+
+    with measure('envfile.expand'):
+
+        # values without templates are taken as is
+        expanded = {key: val for key, val in env_vars.items() if '${' not in val}
+
+        if len(expanded) == len(env_vars):
+            return expanded
+
+        for root, val in env_vars.items():
+
+            if root in expanded:
+                continue
+
+            # depth-first walk without recursion: deep chains are fine
+            parts = parsed[root] = parse(val)
+            stack = [(root, iter(parts[2::3]))]
+            visiting = {root}
+
+            while stack:
+                key, names = stack[-1]
+
+                for name in names:
+                    if not name or name == key or name in expanded or name not in env_vars:
+                        # self-references (e.g. PATH=${PATH}:x) without external values are left as is
+                        continue
+
+                    if name in visiting:
+                        chain = ' -> '.join([item[0] for item in stack] + [name])
+                        raise ValueError(f'Circular reference in .env variables: {chain}')
+
+                    parsed[name] = parse(env_vars[name])
+                    stack.append((name, iter(parsed[name][2::3])))
+                    visiting.add(name)
+                    break
+
+                else:
+                    parts = parsed.pop(key)
+                    chunks = []
+
+                    for idx in range(0, len(parts) - 1, 3):
+                        name = parts[idx + 2]
+                        chunks.append(parts[idx])
+                        chunks.append(expanded.get(name, parts[idx + 1]) if name else parts[idx + 1])
+
+                    chunks.append(parts[-1])
+
+                    expanded[key] = ''.join(chunks)
+                    visiting.discard(key)
+                    stack.pop()
+
+    return {key: expanded[key] for key in env_vars}
+
+
+def _expand_pairs(pairs: Iterable[tuple[str, str]]) -> dict:
+    # Values from OS environment take precedence in templates.
+    return expand_vars(dict(pairs), os.environ.get)
+
+
+def read_envfile(
+        fpath: str | Path,
+        *,
+        prefix: str = '',
+        include: Iterable[str] | None = None,
+        use_mmap: bool = False,
+        encoding: str | None = None,
+) -> dict:
     """Reads environment variables from .env key-value file.
 
     Rules:
@@ -34,92 +485,188 @@ def read_envfile(fpath: str | Path) -> dict:
         * Multiline values are supported (require to be quoted with \n inside values or actual unix newlines);
         * Invalid lines are ignored;
         * Matching opening-closing quotes are stripped;
-        * ${VAL} will be replaced with VAL value previously defined in .env file(s)
-          or currently available in env.
+        * ${VAL} will be replaced with VAL value currently available in env
+          or defined anywhere in .env file (see `expand_vars()`).
 
     Returns a dictionary. Empty dictionary is returned if file is not accessible.
 
     :param fpath:
 
+    :param prefix: Only read variables with names starting with this prefix.
+        Other entries are skipped without being decoded (with `use_mmap`) or expanded,
+        so they are not available for ${VAL} templates either.
+
+    :param include: Only read these variables (in addition to prefixed ones if `prefix` is set).
+        Filtering is the same as for `prefix`.
+
+    :param use_mmap: Memory-map the file instead of reading it line by line.
+        Beneficial for very large files. See `iter_envfile()` for limitations.
+
+    :param encoding: File encoding. Default: locale preferred encoding.
+
     """
-    environ = os.environ
-    env_vars = {}
+    pairs = iter_envfile(fpath, prefix=prefix, include=include, use_mmap=use_mmap, encoding=encoding)
 
-    try:
+    if COLLECTORS:
+        # read everything at once to separate tokenization from expansion
+        with measure('envfile.tokenize'):
+            pairs = list(pairs)
 
-        with Path(fpath).open() as f:
-            lines = f.readlines()
+    return _expand_pairs(pairs)
 
-    except OSError:
-        return env_vars
 
-    def drop_quotes(quote_char, val):
-        if val.startswith(quote_char) and val.endswith(quote_char):
-            val = val.replace('\\n', '\n').strip(quote_char)
-        return val
+async def aread_envfile(fpath: str | Path, **kwargs) -> dict:
+    """Asynchronous version of `read_envfile()`. File is read in a thread.
+
+    :param fpath:
+
+    :param kwargs: `read_envfile()` keyword arguments.
+
+    """
+    import asyncio  # noqa: PLC0415
+
+    return await asyncio.to_thread(read_envfile, fpath, **kwargs)
+
+
+class EnvfilesSnapshot:
+    """Cache for parsed .env files keyed on files modification time and size.
+
+    Files unchanged since they were parsed are not tokenized again.
+    Cache may be persisted into a (marshal) file to be reused by other processes.
+
+    !!! warning
+        Values from the snapshot file are trusted: keep it in a directory
+        writable only by the user running your application.
+
+    """
+    version: int = 2
+    """Snapshot file format version."""
 
-    idx = 0
+    def __init__(self, path: str | Path = ''):
+        """
+        :param path: Snapshot file path. If not set, snapshot is kept in memory only.
 
-    while True:
+        """
+        self.path = path
+        self.entries: dict[tuple, tuple[tuple[int, int], tuple[tuple[str, str], ...]]] = {}
+        """(file path, prefix, included keys) to (file stamp, pairs) mapping."""
+        self.changed = False
+        self.load()
+
+    def load(self):
+        """Loads snapshot from file (if any)."""
+        if not self.path:
+            return
 
         try:
-            line = lines[idx].strip()
+            with Path(self.path).open('rb') as f:
+                version, entries = marshal.load(f)
 
-        except IndexError:
-            # no more lines
-            break
+        except (OSError, EOFError, ValueError, TypeError):
+            return
 
-        if not line or line.startswith('#'):
-            idx += 1
-            continue
+        if version == self.version:
+            self.entries.update(entries)
 
-        key, _, val = line.partition('=')
-        key = key.strip()
+    def save(self):
+        """Saves snapshot into file (if set) if there were changes since the last save."""
+        if not (self.path and self.changed):
+            return
 
-        if not key:
-            idx += 1
-            continue
+        import tempfile  # noqa: PLC0415
 
-        val = val.strip()
+        path = Path(self.path)
 
-        ahead_bag = []
+        try:
+            # unique temporary file so that concurrent processes do not overwrite each other's data
+            fd, path_tmp = tempfile.mkstemp(prefix=f'{path.name}.', suffix='.tmp', dir=path.parent)
+            path_tmp = Path(path_tmp)
 
-        if val == '"' or (val.startswith('"') and not val.endswith('"')):
-            # check ahead whether there is a multiple lines value
-            for ahead_idx in range(idx+1, len(lines)):
-                ahead_line = lines[ahead_idx].strip()
-                ahead_key, _, _ = ahead_line.partition('=')
-                ahead_key = ahead_key.strip()
+        except OSError:
+            # Snapshot is just a cache. Failing to save it is not critical.
+            return
 
-                if ahead_key and (ahead_line != ahead_key) and ahead_key.upper() == ahead_key:
-                    # next definition is valid stop here
-                    break
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump((self.version, self.entries), f)
+
+            path_tmp.replace(path)
+
+        except OSError:
+            path_tmp.unlink(missing_ok=True)
+            return
+
+        self.changed = False
 
-                ahead_bag.append(ahead_line)
-                idx += 1
+    def tokenize(
+            self,
+            fpath: str | Path,
+            *,
+            prefix: str = '',
+            include: Iterable[str] | None = None,
+    ) -> tuple[tuple[str, str], ...]:
+        """Returns (key, value) pairs from .env file (see `iter_envfile()`)
+        tokenizing it only if the file is changed since the last call.
+
+        :param fpath:
+
+        :param prefix: Only return keys starting with this prefix.
+
+        :param include: Only return these keys (in addition to prefixed ones if `prefix` is set).
+
+        """
+        fpath = Path(fpath).absolute()
+
+        try:
+            stat = fpath.stat()
 
-        if ahead_bag:
-            # normalize into a string with \n
-            if val != '"':
-                # do not insert an empty line if there's a single dangling "
-                val = f'{val}\\n'
-            val = f'{val}' + '\\n'.join(ahead_bag)
-            ahead_bag.clear()
+        except OSError:
+            return ()
 
-        val = drop_quotes("'", drop_quotes('"', val))
+        if include is not None:
+            include = tuple(sorted(set(include)))
 
-        for match in RE_TPL_VAR.findall(val):
-            var_tpl, var_name = match
+        key = (f'{fpath}', prefix, include)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(key)
 
-            var_val = environ.get(var_name)
+        if entry is not None and entry[0] == stamp:
+            COLLECTORS and record('cache.envfile.hit')
+            return entry[1]
 
-            if var_val is None:
-                var_val = env_vars.get(var_name)
+        COLLECTORS and record('cache.envfile.miss')
 
-            if var_val is not None:
-                val = val.replace(var_tpl, var_val, 1)
+        with measure('envfile.tokenize'):
+            pairs = tuple(iter_envfile(fpath, prefix=prefix, include=include))
+        self.entries[key] = (stamp, pairs)
+        self.changed = True
+
+        return pairs
+
+    def read(self, fpath: str | Path, **kwargs) -> dict:
+        """The same as `read_envfile()` but uses snapshot for unchanged files.
+
+        :param fpath:
+
+        :param kwargs: `.tokenize()` keyword arguments.
+
+        """
+        return _expand_pairs(self.tokenize(fpath, **kwargs))
+
+
+_SNAPSHOTS: dict[str, EnvfilesSnapshot] = {}
+
+
+def get_snapshot(path: str | Path = '') -> EnvfilesSnapshot:
+    """Returns process-wide .env files snapshot object for the given snapshot file path.
+
+    :param path: Snapshot file path. If not set, in-memory snapshot is returned.
+
+    """
+    path = os.fspath(path)
+    snapshot = _SNAPSHOTS.get(path)
 
-        env_vars[key] = val
-        idx += 1
+    if snapshot is None:
+        snapshot = _SNAPSHOTS[path] = EnvfilesSnapshot(path)
 
-    return env_vars
+    return snapshot
@@ -0,0 +1,139 @@
+import logging
+from pathlib import Path
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .envs import Environment
+
+
+LOGGER = logging.getLogger(__name__)
+
+TypeChanges = dict[str, tuple[str | None, str | None]]
+
+
+class EnvfilesWatcher:
+    """Polls .env files of an environment object and applies changed values.
+
+    Only changed files are parsed again (see `EnvfilesSnapshot`),
+    only changed variables are set.
+
+    ```python
+    watcher = env.watch_envfiles(on_change=lambda changes: print(changes))
+    ...
+    watcher.stop()
+    ```
+
+    !!! note
+        Settings (see `SettingsBase`) pick up changed values on the next access.
+        Objects holding values copies (e.g. from `Environment.freeze()`)
+        should be recreated in `on_change` callbacks.
+
+    """
+
+    def __init__(
+            self,
+            env: 'Environment',
+            *,
+            interval: float = 1.0,
+            prefix: str = '',
+            keys: 'Iterable[str] | None' = None,
+    ):
+        """
+        :param env: Environment object to watch .env files for.
+
+        :param interval: Polling interval in seconds.
+
+        :param prefix: Only apply variables with names starting with this prefix.
+
+        :param keys: Only apply these variables (in addition to prefixed ones if `prefix` is set).
+
+        """
+        self.env = env
+        self.interval = interval
+        self.prefix = prefix
+        self.keys = None if keys is None else frozenset(keys)
+
+        self.callbacks: list[Callable[[TypeChanges], None]] = []
+        """Callables to be called with changes dictionary:
+        variable names to (old value, new value) tuples.
+
+        """
+
+        self._stamps = self._get_stamps(env.envfiles)
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    @staticmethod
+    def _get_stamp(fname: str) -> tuple[int, int] | None:
+        try:
+            stat = Path(fname).stat()
+
+        except OSError:  # pragma: nocover
+            # removed after lookup
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def _get_stamps(self, files) -> dict[str, tuple[int, int] | None]:
+        return {fname: self._get_stamp(fname) for fname in files}
+
+    def check(self) -> TypeChanges:
+        """Checks .env files for changes and applies them.
+        Returns changes dictionary.
+
+        Callbacks exceptions are logged and do not prevent other callbacks from being called.
+
+        """
+        env = self.env
+
+        stamps = self._get_stamps(env.get_envfiles())
+
+        if stamps == self._stamps:
+            return {}
+
+        # remembered beforehand, so that failing files are not applied (and reported) again until changed
+        self._stamps = stamps
+
+        changes = env.update_from_envfiles(prefix=self.prefix, keys=self.keys)
+
+        if changes:
+            for callback in self.callbacks:
+                try:
+                    callback(changes)
+
+                except Exception:  # noqa: PERF203
+                    LOGGER.exception('envbox watcher callback %r failed', callback)
+
+        return changes
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+
+            except Exception:  # noqa: PERF203
+                # e.g. circular references in .env files: polling goes on until files are fixed
+                LOGGER.exception('envbox watcher failed to apply .env files changes')
+
+    def start(self):
+        """Starts polling in a background (daemon) thread."""
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name='envbox-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops polling."""
+        thread = self._thread
+
+        if thread is None:
+            return
+
+        self._stopped.set()
+        thread.join()
+        self._thread = None
@@ -1,7 +1,22 @@
+from time import monotonic, sleep
+
 import pytest
 
-from envbox import get_environment
-from envbox.detectors import Environ, File, get_detector
+from envbox import get_environment, invalidate
+from envbox.detectors import Detector, DetectorsChain, Environ, File, get_detector
+from envbox.timings import collect_timings
+
+
+class Sleepy(Detector):
+
+    name = 'sleepy'
+    delay = 0
+    calls = 0
+
+    def probe(self) -> str | None:
+        type(self).calls += 1
+        sleep(self.delay)
+        return self.source
 
 
 def test_get_detector():
@@ -24,3 +39,60 @@ def test_file_detector(tmpdir):
     env = get_environment(detectors_opts={'file': {'source': f'{path}'}})
 
     assert env.is_testing
+
+
+def test_chain():
+
+    def chain(*specs, **kwargs):
+        return DetectorsChain([Sleepy(source=source, delay=delay, timeout=0.2) for source, delay in specs], **kwargs)
+
+    assert chain((None, 0), ('testing', 0), ('staging', 0)).probe() == 'testing'
+    assert chain((None, 0)).probe() is None
+
+    # priority is honored
+    started = monotonic()
+    assert chain(('staging', 0.1), (None, 0.1), ('testing', 0), parallel=True).probe() == 'staging'
+    assert monotonic() - started < 0.2
+
+    assert chain((None, 0), ('testing', 0), parallel=True).probe() == 'testing'
+    assert chain((None, 0), (None, 0), parallel=True).probe() is None
+
+    # timed out detectors are skipped
+    with collect_timings() as timings:
+        assert chain(('staging', 0.5), ('testing', 0), parallel=True).probe() == 'testing'
+
+    assert timings.get_count('detect.sleepy.timeout') == 1
+
+
+def test_chain_ttl(monkeypatch):
+    Sleepy.calls = 0
+
+    detectors = [Sleepy(source='testing')]
+
+    assert DetectorsChain(detectors, ttl=10).probe() == 'testing'
+    assert DetectorsChain(detectors, ttl=10).probe() == 'testing'
+    assert Sleepy.calls == 1
+
+    # unhashable options are not cached
+    assert DetectorsChain([Sleepy(source='testing', opts=[])], ttl=10).probe() == 'testing'
+    assert Sleepy.calls == 2
+
+    # not cached without ttl
+    DetectorsChain(detectors).probe()
+    assert Sleepy.calls == 3
+
+    invalidate()
+    DetectorsChain(detectors, ttl=10).probe()
+    assert Sleepy.calls == 4
+
+    # defaults
+    monkeypatch.setattr(DetectorsChain, 'ttl', 0.05)
+    monkeypatch.setattr(DetectorsChain, 'parallel', True)
+    monkeypatch.setenv('PYTHON_ENV', 'staging')
+
+    assert get_environment(detectors=[Environ, Sleepy], use_envfiles=False).is_staging
+    monkeypatch.setenv('PYTHON_ENV', 'production')
+    assert get_environment(detectors=[Environ, Sleepy], use_envfiles=False).is_staging
+
+    sleep(0.06)
+    assert get_environment(detectors=[Environ, Sleepy], use_envfiles=False).is_production
@@ -1,11 +1,13 @@
+import asyncio
 import os
 from pathlib import Path
+from typing import ClassVar
 
 import pytest
 
-from envbox import DEVELOPMENT, PRODUCTION, get_environment
+from envbox import DEVELOPMENT, PRODUCTION, OverlayEnviron, get_environment, invalidate
 from envbox.detectors import Environ
-from envbox.envs import Development, get_type, register_type
+from envbox.envs import Development, Environment, FrozenEnviron, Production, get_type, register_type
 
 
 def test_get_type():
@@ -35,6 +37,58 @@ def test_register_type(monkeypatch):
     assert get_environment().is_production
 
 
+def test_compare():
+
+    env = Production()
+
+    assert env == 'production'
+    assert 'production' == env
+    assert env != 'prod'
+    assert env != 'development'
+    assert env != 1
+    assert env == Production()
+    assert env != Environment('prod')
+    assert env == Environment('production')
+    assert env != Development()
+
+    # alias-aware
+    assert env.matches('prod')
+    assert env.matches('production')
+    assert env.matches(Environment('prod'))
+    assert not env.matches('development')
+    assert not env.matches(Development())
+
+    assert Production.names == {'production', 'prod'}
+    assert hash(env) == hash('production')
+    assert {PRODUCTION: 1}[env] == 1
+    assert {env: 1}['production'] == 1
+    assert {'prod': 1}.get(env) is None
+    assert len({env, Production(), Environment('production'), 'production'}) == 1
+    assert len({env, Environment('prod')}) == 2
+
+    # equal objects have equal hashes
+    items = [env, Production(), Environment('prod'), Development(), 'prod', 'production', 'development']
+
+    for left in items:
+        for right in items:
+            if left == right:
+                assert hash(left) == hash(right)
+
+    class Custom(Environment):
+
+        name = 'custom'
+        aliases: ClassVar[list[str]] = ['cst']
+
+    assert Custom().matches('cst')
+    assert Custom('other') == 'other'
+    assert Custom('other') != 'custom'
+    assert Custom('other').matches('custom')
+
+    register_type(Custom, 'mine')
+    assert Custom.names == {'custom', 'cst', 'mine'}
+    assert Custom().matches('mine')
+
+
 def test_set_get():
 
     env = Development()
@@ -51,11 +105,110 @@ def test_set_get():
 
     assert env.get('two', '3') == '3'
 
-    env.one = 3
-    assert env.one == '3'
+    # non-string values in custom storage
+    assert Development(env={'PORT': 80}).get_casted('PORT') == 80
+
+    env.ENVBOX_ATTR = 3
+    assert env.ENVBOX_ATTR == '3'
+    assert env.ENVBOX_ATTR_BOGUS is None
+    del env.ENVBOX_ATTR
+    assert 'ENVBOX_ATTR' not in env
+
+    # typos do not go to environment
+    with pytest.raises(AttributeError, match='type_cats'):
+        env.type_cats = True
+
+    with pytest.raises(AttributeError):
+        env.one  # noqa: B018
+
+    assert not hasattr(env, 'one')
+
+    # subclasses declare their attributes
+    class Custom(Development):
+
+        extra: int
+        other = 'x'
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.extra = 1
+            self.other = 'y'
+
+    env = Custom()
+    assert env.extra == 1
+    assert env.other == 'y'
+    assert Custom.other == 'x'
+
+    del env.extra
+    assert not hasattr(env, 'extra')
+
+    with pytest.raises(AttributeError, match='declared in class body'):
+        env.undeclared = True
+    assert env.get('one') == '2'
 
     env.type_cast = True
-    assert env.get('one') == 3
+    assert env.get('one') == 2
+    assert 'type_cast' not in env
+
+
+def test_get_batch():
+
+    env = Development(env=OverlayEnviron({'A': '1', 'B': '1', 'C': '[1]', 'D': '[1]', 'E': 'yes'}))
+
+    assert env.get_batch(['A', 'B', 'X']) == {'A': '1', 'B': '1', 'X': None}
+
+    batch = env.get_batch(
+        ['A', 'B', 'C', 'D', 'E', 'X', 'Y'],
+        defaults={'X': 'x', 'A': 5},
+        types={'B': float, 'E': bool},
+        type_cast=True,
+    )
+    assert batch == {'A': 1, 'B': 1.0, 'C': [1], 'D': [1], 'E': True, 'X': 'x', 'Y': None}
+    assert batch['C'] is not batch['D']
+
+    # containers are literal-evaluated
+    assert env.get_batch(['C', 'E'], types={'C': list, 'E': dict}) == {'C': [1], 'E': 'yes'}
+
+    env.type_cast = True
+    assert env.get_batch(['E'], types={'E': str}) == {'E': 'yes'}
+    assert env.get_batch(['A']) == {'A': 1}
+
+
+def test_gettree():
+
+    env = Development(env=OverlayEnviron({
+        'APP_DB__HOST': 'localhost',
+        'APP_DB__PORT': '5432',
+        'APP_DB__OPTS__SSL': 'true',
+        'APP_DEBUG': '{"a": 1}',
+        'OTHER__ONE': '1',
+    }))
+
+    assert env.gettree('APP_', types={'DB__PORT': int}) == {
+        'DB': {'HOST': 'localhost', 'PORT': 5432, 'OPTS': {'SSL': 'true'}},
+        'DEBUG': '{"a": 1}',
+    }
+    assert env.gettree('APP_', type_cast=True)['DEBUG'] == {'a': 1}
+    assert env.gettree('APP_', types={'DEBUG': dict})['DEBUG'] == {'a': 1}
+    assert env.gettree('APP_DB__', sep='_') == {'HOST': 'localhost', 'PORT': '5432', 'OPTS': {'': {'SSL': 'true'}}}
+    assert env.gettree('OTHER') == {'': {'ONE': '1'}}
+
+    env.set('APP_DB', 'x')
+
+    with pytest.raises(ValueError, match='APP_DB__HOST conflicts with APP_DB value'):
+        env.gettree('APP_')
+
+    # value casted into None is still a value
+    env.set('APP_DB', 'None')
+
+    with pytest.raises(ValueError, match='APP_DB__HOST conflicts with APP_DB value'):
+        env.gettree('APP_', type_cast=True)
+
+    env.drop('APP_DB')
+    env.set('APP_DEBUG__ON', 'x')
+
+    with pytest.raises(ValueError, match='conflicts'):
+        env.gettree('APP_', type_cast=True)
 
 
 def test_set_get_many(datafix_dir):
@@ -94,18 +247,208 @@ def test_set_get_many(datafix_dir):
         assert envbox_tst['MYQUOTED2'] == 'some "2" quoted'
         assert envbox_tst['MYVAL1'] == 'from_dev_local'
         assert envbox_tst['MYVAL2'] == 'enim'
-        assert envbox_tst['OTHER'] == 'mine ${ENVBOXTST_CHANGE} $VAL enim'
+        assert envbox_tst['OTHER'] == 'from_dev_local ${ENVBOXTST_CHANGE} $VAL enim'
 
         assert len(envbox_tst) == 13
 
+        assert env.envfiles == ('.env', '.env.development', '.env.local', '.env.dev.local')
+
     finally:
         env.dropmany(prefix='ENVBOXTST_')
         os.chdir(cwd)
 
 
+def test_envfiles_roots(datafix_dir, tmp_path, monkeypatch):
+
+    (tmp_path / '.env.local').write_text('ENVBOXROOT_LOCAL=tmp')
+    (tmp_path / '.env.dev').mkdir()
+
+    monkeypatch.setattr(Development, 'envfiles_roots', [f'{datafix_dir}', f'{tmp_path / "bogus"}', f'{tmp_path}'])
+
+    env = Development()
+    assert env.get_envfiles() == [
+        f'{datafix_dir / ".env"}',
+        f'{datafix_dir / ".env.development"}',
+        f'{datafix_dir / ".env.local"}',
+        f'{datafix_dir / ".env.dev.local"}',
+        f'{tmp_path / ".env.local"}',
+    ]
+
+    try:
+        env.update_from_envfiles()
+        assert env.get('ENVBOXROOT_LOCAL') == 'tmp'
+        assert env.get('ENVBOXTST_FROMDEV') == 'true'
+        assert len(env.envfiles) == 5
+
+    finally:
+        env.dropmany(prefix='ENVBOXTST_')
+        env.drop('ENVBOXROOT_LOCAL')
+
+
+def test_envfiles_filtered(tmp_path, monkeypatch):
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('ENVBOXFLT_ONE=1\nENVBOXFLT_TWO=${ENVBOXFLT_ONE}2\nSHARED=s\nOTHER=o\n')
+    monkeypatch.setattr(Development, 'envfiles_roots', [f'{tmp_path}'])
+
+    env = Development(env=OverlayEnviron({}))
+
+    assert env.update_from_envfiles(prefix='ENVBOXFLT_', keys=['SHARED']) == {
+        'ENVBOXFLT_ONE': (None, '1'),
+        'ENVBOXFLT_TWO': (None, '12'),
+        'SHARED': (None, 's'),
+    }
+    assert 'OTHER' not in env
+
+    # variables applied earlier but filtered out now are kept
+    assert env.update_from_envfiles(keys=['OTHER']) == {'OTHER': (None, 'o')}
+    assert env.get('ENVBOXFLT_TWO') == '12'
+    assert env.get('SHARED') == 's'
+
+    # filtered out variables are available for templates if already set
+    assert env.update_from_envfiles(keys=['ENVBOXFLT_TWO']) == {}
+    env.drop('ENVBOXFLT_ONE')
+    assert env.update_from_envfiles(keys=['ENVBOXFLT_TWO']) == {'ENVBOXFLT_TWO': ('12', '${ENVBOXFLT_ONE}2')}
+
+    envfile.write_text('ENVBOXFLT_ONE=1\n')
+    assert env.update_from_envfiles(prefix='ENVBOXFLT_') == {'ENVBOXFLT_TWO': ('${ENVBOXFLT_ONE}2', None)}
+    assert env.get('SHARED') == 's'
+
+    # templates use updated values
+    envfile.write_text('ENVBOXFLT_THREE=${SHARED}3\nSHARED=t\n')
+    assert env.update_from_envfiles(keys=['ENVBOXFLT_THREE', 'SHARED']) == {
+        'ENVBOXFLT_THREE': (None, 't3'),
+        'SHARED': ('s', 't'),
+    }
+
+    # keys iterators are used for every file
+    (tmp_path / '.env.local').write_text('ENVBOXFLT_FOUR=4\nENVBOXFLT_FIVE=5\n')
+    assert env.update_from_envfiles(keys=iter(['ENVBOXFLT_THREE', 'SHARED', 'ENVBOXFLT_FOUR'])) == {
+        'ENVBOXFLT_FOUR': (None, '4'),
+    }
+
+    (tmp_path / '.env.local').write_text('ENVBOXFLT_FOUR=44\nENVBOXFLT_FIVE=5\n')
+    assert asyncio.run(env.aupdate_from_envfiles(keys=(key for key in ['SHARED', 'ENVBOXFLT_FOUR']))) == {
+        'ENVBOXFLT_FOUR': ('4', '44'),
+    }
+    assert env.get('SHARED') == 't'
+
+
+def test_overlay(datafix_dir, monkeypatch):
+
+    monkeypatch.setenv('ENVBOXOVR_BASE', 'base')
+    monkeypatch.setenv('ENVBOXOVR_DROP', 'drop')
+
+    overlay = OverlayEnviron()
+    env = Development(env=overlay)
+
+    assert env.env is overlay
+    assert env.get('ENVBOXOVR_BASE') == 'base'
+
+    env.set('ENVBOXOVR_NEW', 1)
+    env.drop('ENVBOXOVR_DROP')
+    env.set('ENVBOXOVR_BASE', 'changed')
+
+    with pytest.raises(KeyError):
+        env.drop('ENVBOXOVR_DROP')
+
+    assert 'ENVBOXOVR_DROP' not in env
+    assert env.get('ENVBOXOVR_DROP') is None
+    assert env.getmany('ENVBOXOVR_') == {'BASE': 'changed', 'NEW': '1'}
+    assert len(overlay) == len(os.environ)
+
+    # os.environ is not touched
+    assert 'ENVBOXOVR_NEW' not in os.environ
+    assert os.environ['ENVBOXOVR_DROP'] == 'drop'
+    assert os.environ['ENVBOXOVR_BASE'] == 'base'
+
+    env.export()
+    assert not overlay.changed
+    assert not overlay.dropped
+    assert 'ENVBOXOVR_DROP' not in os.environ
+    assert os.environ['ENVBOXOVR_BASE'] == 'changed'
+    assert os.environ.pop('ENVBOXOVR_NEW') == '1'
+
+    # not an overlay
+    Development().export()
+
+    # envfiles are loaded into overlay
+    monkeypatch.chdir(datafix_dir)
+    overlay = OverlayEnviron()
+    env = get_environment(env=overlay, cached=True)
+    assert get_environment(env=overlay, cached=True) is env
+    assert get_environment(cached=True, use_envfiles=False) is not env
+    invalidate()
+
+    assert env.env is overlay
+    assert env.get('ENVBOXTST_FROMDEV') == 'true'
+    assert 'ENVBOXTST_FROMDEV' not in os.environ
+
+
+def test_freeze(monkeypatch):
+
+    monkeypatch.setenv('ENVBOXFRZ_ONE', '1')
+
+    env = Development(type_cast=True)
+    frozen = env.freeze()
+
+    assert isinstance(frozen, Development)
+    assert isinstance(frozen.env, FrozenEnviron)
+    assert not hasattr(frozen.env, '__dict__')
+    assert frozen.type_cast
+    assert frozen.prefix_index
+
+    monkeypatch.setenv('ENVBOXFRZ_TWO', '2')
+
+    assert frozen.get('ENVBOXFRZ_ONE') == 1
+    assert frozen['ENVBOXFRZ_TWO'] is None
+    assert 'ENVBOXFRZ_ONE' in frozen
+    assert frozen.getmany('ENVBOXFRZ_') == {'ONE': 1}
+    assert len(frozen.env) == len(os.environ) - 1
+    assert 'ENVBOXFRZ_ONE' in list(frozen.env)
+    assert frozen.env['ENVBOXFRZ_ONE'] == '1'
+
+    with pytest.raises(TypeError):
+        frozen.set('ENVBOXFRZ_ONE', 3)
+
+    with pytest.raises(TypeError):
+        frozen.set('ENVBOXFRZ_ONE', 3, overwrite=False)
+
+    with pytest.raises(TypeError):
+        frozen.drop('ENVBOXFRZ_ONE')
+
+
+def test_prefix_index():
+
+    env = Development(prefix_index=True)
+    env.setmany({'one': 1, 'two': 2, 'ENVBOXIDX_three': 3}, prefix='ENVBOXIDX_')
+
+    assert env._index is None
+    assert env.getmany('ENVBOXIDX_') == {'one': '1', 'two': '2', 'ENVBOXIDX_three': '3'}
+    assert env._index is not None
+
+    # index is kept in sync
+    env.set('ENVBOXIDX_four', 4)
+    env['ENVBOXIDX_one'] = 10
+    env.drop('ENVBOXIDX_two')
+    assert env.getmany_casted('ENVBOXIDX_') == {'one': 10, 'four': 4, 'ENVBOXIDX_three': 3}
+
+    # bypassing changes
+    os.environ['ENVBOXIDX_five'] = '5'
+    os.environ.pop('ENVBOXIDX_four')
+    assert env.getmany('ENVBOXIDX_') == {'one': '10', 'ENVBOXIDX_three': '3'}
+    env.reindex()
+    assert env.getmany('ENVBOXIDX_') == {'one': '10', 'five': '5', 'ENVBOXIDX_three': '3'}
+
+    env.dropmany(prefix='ENVBOXIDX_')
+    assert env.getmany('ENVBOXIDX_') == {}
+    assert env._index is not None
+    assert not Development().getmany('ENVBOXIDX_')
+
+
 def test_drop():
     env = Development()
-    env.setmany({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5})
+    env.setmany({'a': 1, 'b': 2, 'C': 3, 'd': 4, 'e': 5})
 
     assert 'a' in env
 
@@ -117,9 +460,12 @@ def test_drop():
 
     assert 'b' not in env
 
-    del env.c
+    del env.C
+
+    assert 'C' not in env
 
-    assert 'c' not in env
+    with pytest.raises(AttributeError):
+        del env.d
 
     env.dropmany(['d', 'e'])
     assert 'd' not in env
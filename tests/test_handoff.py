@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+
+import pytest
+
+from envbox import OverlayEnviron, get_environment, invalidate
+from envbox.envs import Production
+from envbox.handoff import dump, load
+from envbox.settings import SettingsBase
+
+
+class _Settings(SettingsBase):
+
+    HO_ONE = 1
+    HO_LIST = None
+    HO_UNSET = 'default'
+
+
+Settings = _Settings()
+
+
+def test_handoff(tmp_path, monkeypatch):
+    monkeypatch.setattr(Production, 'envfiles_roots', [f'{tmp_path}'])
+    (tmp_path / '.env').write_text('ENVBOXHO_FILE=fromfile\nHO_LIST=[1, 2]\n')
+
+    overlay = OverlayEnviron({'HO_ONE': '5'})
+    env = Production(env=overlay, type_cast=True)
+    env.update_from_envfiles()
+
+    payload = dump(env, settings=[Settings, _Settings])
+
+    # child process
+    invalidate()
+    _Settings.HO_LIST._cached = (None, None)
+    Settings.HO_ONE = 10
+
+    child_storage = OverlayEnviron({'HO_ONE': '5'})
+    child_env = load(payload, env=child_storage)
+    invalidate()
+
+    assert child_env.is_production
+    assert child_env.type_cast
+    assert child_env.envfiles == env.envfiles
+    assert child_env.env is child_storage
+    assert child_storage['ENVBOXHO_FILE'] == 'fromfile'
+    assert 'ENVBOXHO_FILE' not in os.environ
+
+    assert _Settings.HO_LIST._cached == ('[1, 2]', [1, 2])
+
+    with pytest.raises(ValueError, match='version'):
+        load(b'\x80\x05K\x00NN\x87.')
+
+    # changes from files are tracked
+    (tmp_path / '.env').write_text('ENVBOXHO_FILE=changed\n')
+    assert child_env.update_from_envfiles() == {
+        'ENVBOXHO_FILE': ('fromfile', 'changed'),
+        'HO_LIST': ('[1, 2]', None),
+    }
+
+
+def test_handoff_spawn():
+    env = Production(env=OverlayEnviron({}))
+    env._apply_envfiles(['.env'], [[('ENVBOXHO_SPAWN', 'spawned')]])
+
+    payload = dump(env)
+
+    with multiprocessing.get_context('spawn').Pool(1, initializer=load, initargs=(payload,)) as pool:
+        assert pool.apply(os.getenv, ('ENVBOXHO_SPAWN',)) == 'spawned'
+
+    assert 'ENVBOXHO_SPAWN' not in os.environ
+
+
+def test_handoff_cached(monkeypatch):
+    monkeypatch.setenv('HO_ONE', '3')
+    monkeypatch.setenv('PYTHON_ENV', 'production')
+
+    invalidate()
+    payload = dump(settings=[Settings])
+
+    # child process
+    monkeypatch.setenv('PYTHON_ENV', 'testing')
+    Settings.HO_ONE = 10
+
+    try:
+        env = load(payload)
+        assert get_environment(cached=True) is env
+        assert env.is_production
+        assert Settings.HO_ONE == 3
+        assert Settings.HO_UNSET == 'default'
+
+    finally:
+        invalidate()
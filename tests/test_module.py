@@ -1,8 +1,12 @@
+import asyncio
 import os
+import subprocess
+import sys
 
 import pytest
 
-from envbox import PRODUCTION, get_environment, import_by_environment
+import envbox
+from envbox import PRODUCTION, aget_environment, get_environment, import_by_environment, invalidate
 
 
 def test_get_environment():
@@ -24,6 +28,61 @@ def test_get_environment():
     assert env == PRODUCTION
 
 
+def test_get_environment_cached(monkeypatch):
+
+    invalidate()
+
+    env = get_environment(cached=True)
+    assert env.is_development
+    assert get_environment(cached=True) is env
+    assert get_environment() is not env
+
+    monkeypatch.setenv('PYTHON_ENV', PRODUCTION)
+
+    # cached object is still returned
+    assert get_environment(cached=True) is env
+
+    # keyed on arguments
+    env_opts = get_environment(cached=True, detectors_opts={'environ': {'source': 'PYTHON_ENV'}})
+    assert env_opts.is_production
+    assert get_environment(cached=True, detectors_opts={'environ': {'source': 'PYTHON_ENV'}}) is env_opts
+    assert get_environment(cached=True, detectors=['file']).is_development
+
+    # unhashable options: not cached
+    opts = {'environ': {'source': 'PYTHON_ENV', 'extra': []}}
+    env_unhashable = get_environment(cached=True, detectors_opts=opts)
+    assert env_unhashable.is_production
+    assert get_environment(cached=True, detectors_opts=opts) is not env_unhashable
+    assert asyncio.run(aget_environment(cached=True, detectors_opts=opts)).is_production
+
+    invalidate()
+
+    assert get_environment(cached=True).is_production
+
+    invalidate()
+
+
+def test_aget_environment(datafix_dir, monkeypatch):
+
+    monkeypatch.chdir(datafix_dir)
+    invalidate()
+
+    env = asyncio.run(aget_environment(cached=True))
+
+    try:
+        assert env.is_development
+        assert asyncio.run(aget_environment(cached=True)) is env
+        assert env.envfiles == ('.env', '.env.development', '.env.local', '.env.dev.local')
+        assert env.get('ENVBOXTST_MYVAL1') == 'from_dev_local'
+        assert env.get('ENVBOXTST_OTHER') == 'from_dev_local ${ENVBOXTST_CHANGE} $VAL enim'
+
+        assert asyncio.run(aget_environment(default=None, detectors=[])) is None
+
+    finally:
+        env.dropmany(prefix='ENVBOXTST_')
+        invalidate()
+
+
 def test_autoimport(monkeypatch):
 
     with pytest.raises((ImportError, SystemError)):
@@ -36,3 +95,35 @@ def test_autoimport(monkeypatch):
     env = import_by_environment()
 
     assert env.is_development
+
+
+def test_lazy_import():
+
+    # heavy modules are not imported
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys, envbox; print(" ".join(sys.modules))'],
+        capture_output=True, text=True, check=True,
+    )
+    imported = set(result.stdout.split())
+
+    for module in ('ast', 'inspect', 'typing', 'envbox.base', 'envbox.envs', 'envbox.utils'):
+        assert module not in imported
+
+    # submodules are available after plain `import envbox`
+    result = subprocess.run(
+        [sys.executable, '-c', (
+            'import envbox; '
+            'print(envbox.detectors.register_detector.__name__, envbox.utils.read_envfile.__name__, '
+            'envbox.envs.__name__, envbox.settings.__name__, envbox.base.__name__)'
+        )],
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.split() == [
+        'register_detector', 'read_envfile', 'envbox.envs', 'envbox.settings', 'envbox.base',
+    ]
+
+    assert envbox.get_environment is get_environment
+    assert 'get_environment' in dir(envbox)
+
+    with pytest.raises(AttributeError):
+        envbox.bogus  # noqa: B018
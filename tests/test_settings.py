@@ -1,4 +1,10 @@
+import asyncio
+from threading import Thread
+
+import pytest
+
 from envbox import get_environment
+from envbox.envs import Development
 from envbox.settings import SettingsBase
 
 
@@ -30,3 +36,175 @@ def test_settings():
     Settings.get_environment = lambda *args, **kwargs: None
 
     assert Settings.ANOTHER
+
+
+def test_settings_typed(monkeypatch):
+
+    class _Settings(SettingsBase):
+
+        T_ONE = 1
+        T_SOME = 'two'
+        T_ANOTHER = True
+        T_TIMEOUT: float = 5
+        T_NAMED: 'int' = None
+        T_ANY = None
+        T_HOSTS: list = []  # noqa: RUF012
+        T_FLAG = False
+
+    Settings = _Settings()
+
+    assert _Settings.T_ONE.type is int
+    assert _Settings.T_TIMEOUT.type is float
+    assert _Settings.T_NAMED.type is int
+    assert _Settings.T_ANY.type is None
+    assert _Settings.T_HOSTS.type is None
+
+    monkeypatch.setenv('T_ONE', '3')
+    monkeypatch.setenv('T_SOME', '10')
+    monkeypatch.setenv('T_ANOTHER', 'no')
+    monkeypatch.setenv('T_TIMEOUT', '7')
+    monkeypatch.setenv('T_NAMED', '8')
+    monkeypatch.setenv('T_ANY', '[1, 2]')
+    monkeypatch.setenv('T_HOSTS', "['a', 'b']")
+    monkeypatch.setenv('T_FLAG', '2')
+
+    assert Settings.T_ONE == 3
+    assert Settings.T_SOME == '10'
+    assert Settings.T_ANOTHER is False
+    assert Settings.T_TIMEOUT == 7.0
+    assert Settings.T_NAMED == 8
+    assert Settings.T_ANY == [1, 2]
+    assert Settings.T_HOSTS == ['a', 'b']
+
+    # typed cast failed, literal evaluation is used
+    assert Settings.T_FLAG == 2
+
+    # memoized value is protected from modifications
+    Settings.T_ANY.append(3)
+    assert Settings.T_ANY == [1, 2]
+    assert Settings.T_ANY is not Settings.T_ANY
+
+    monkeypatch.setenv('T_ONE', '4')
+    assert Settings.T_ONE == 4
+
+    monkeypatch.setenv('T_ONE', '80.5')
+    assert Settings.T_ONE == 80.5
+
+
+def test_settings_snapshot(monkeypatch):
+
+    class _Settings(SettingsBase):
+
+        SN_ONE = 1
+        SN_ANY = None
+        SN_FLAG = False
+
+    class _SettingsChild(_Settings):
+
+        SN_TWO: float = 2
+
+    Settings = _SettingsChild()
+
+    monkeypatch.setenv('SN_ANY', '[1, 2]')
+    monkeypatch.setenv('SN_TWO', '3')
+
+    snapshot = Settings.snapshot()
+    assert type(snapshot).__slots__ == ('SN_ONE', 'SN_ANY', 'SN_FLAG', 'SN_TWO')
+    assert type(Settings.snapshot()) is type(snapshot)
+    assert type(_Settings().snapshot()) is not type(snapshot)
+
+    assert snapshot.SN_ONE == 1
+    assert snapshot.SN_ANY == [1, 2]
+    assert snapshot.SN_ANY is not Settings.SN_ANY
+    assert snapshot.SN_TWO == 3.0
+    assert f'{snapshot!r}' == "_SettingsChildSnapshot(SN_ONE=1, SN_ANY=[1, 2], SN_FLAG=False, SN_TWO=3.0)"
+
+    with pytest.raises(AttributeError):
+        snapshot.SN_ONE = 2
+
+    with pytest.raises(AttributeError):
+        del snapshot.SN_ONE
+
+    with pytest.raises(AttributeError):
+        snapshot.BOGUS = 2
+
+    with Settings.override(SN_FLAG=True):
+        assert Settings.snapshot().SN_FLAG is True
+
+    assert not snapshot.SN_FLAG
+
+    # values are read the same way as by attributes
+    class CustomEnv(Development):
+
+        def get(self, key, default=None, *, type_cast=None):
+            return 'from_get' if key == 'SN_ANY' else super().get(key, default, type_cast=type_cast)
+
+    env = CustomEnv()
+    monkeypatch.setattr(_SettingsChild, 'get_environment', lambda self: env)
+
+    assert Settings.SN_ANY == 'from_get'
+    assert Settings.snapshot().SN_ANY == 'from_get'
+
+    Settings.get_environment = lambda *args, **kwargs: None
+    assert Settings.snapshot().SN_ANY is None
+
+
+def test_settings_scope():
+
+    class _Settings(SettingsBase):
+
+        S_ONE = 1
+        S_TWO = 2
+
+    class _SettingsChild(_Settings):
+
+        S_THREE = 3
+
+    Settings = _SettingsChild()
+    assert set(_SettingsChild._settings) == {'S_ONE', 'S_TWO', 'S_THREE'}
+
+    with pytest.raises(AttributeError):
+        with Settings.override(BOGUS=1):
+            pass
+
+    with Settings.override(S_ONE=10) as overridden:
+        assert overridden is Settings
+        assert Settings.S_ONE == 10
+
+        with Settings.override(S_TWO=20):
+            assert Settings.S_ONE == 10
+            assert Settings.S_TWO == 20
+            Settings.S_THREE = 30
+            assert Settings.S_THREE == 30
+
+        assert Settings.S_TWO == 2
+        assert Settings.S_THREE == 3
+
+    assert Settings.S_ONE == 1
+
+    # threads do not share values
+    results = []
+
+    def read():
+        results.append(Settings.S_ONE)
+
+    Settings.S_ONE = 100
+
+    thread = Thread(target=read)
+    thread.start()
+    thread.join()
+
+    assert results == [1]
+    assert Settings.S_ONE == 100
+
+    # tasks do not share overrides
+    async def task(value):
+        with Settings.override(S_TWO=value):
+            await asyncio.sleep(0)
+            return Settings.S_TWO
+
+    async def run():
+        return await asyncio.gather(task(21), task(22))
+
+    assert asyncio.run(run()) == [21, 22]
+    assert Settings.S_TWO == 2
@@ -0,0 +1,47 @@
+from envbox import get_environment, invalidate
+from envbox.timings import COLLECTORS, collect_timings, measure
+from envbox.utils import cast_type, read_envfile
+
+
+def test_timings(datafix_dir, monkeypatch):
+
+    with measure('bogus'):
+        pass
+
+    monkeypatch.chdir(datafix_dir)
+    invalidate()
+
+    with collect_timings() as timings:
+        env = get_environment(cached=True)
+        get_environment(cached=True)
+
+        read_envfile(datafix_dir / '.env')
+        read_envfile(datafix_dir / 'bogus')
+
+        cast_type('12345678')
+        cast_type('12345678')
+
+        assert COLLECTORS == [timings]
+
+    assert not COLLECTORS
+
+    try:
+        assert timings.get_count('bogus') == 0
+        assert timings.get_count('cache.environment.miss') == 1
+        assert timings.get_count('cache.environment.hit') == 1
+        assert timings.get_count('detect.environ') == 1
+        assert timings.get_count('detect.file') == 1
+        assert timings.get_count('envfiles.resolve') == 1
+        assert timings.get_count('envfile.open') >= 2
+        assert timings.get_count('cache.cast.miss') == 1
+        assert timings.get_count('cache.cast.hit') == 1
+        assert timings.get_seconds('cast') > 0
+        assert timings.get_seconds('envfile.tokenize') > 0
+        assert timings.get_seconds('envfile.expand') > 0
+        assert timings.get_count('cache.envfile.hit') + timings.get_count('cache.envfile.miss') == 4
+
+        assert 'detect.environ' in f'{timings}'
+
+    finally:
+        env.dropmany(prefix='ENVBOXTST_')
+        invalidate()
@@ -1,5 +1,17 @@
-from envbox import Environment
-from envbox.utils import cast_type, read_envfile
+import asyncio
+
+import pytest
+
+from envbox import Environment, utils
+from envbox.utils import (
+    EnvfilesSnapshot,
+    aread_envfile,
+    cast_type,
+    expand_vars,
+    get_snapshot,
+    iter_envfile,
+    read_envfile,
+)
 
 
 def test_cast_type():
@@ -9,6 +21,42 @@ def test_cast_type():
     assert cast_type('10') == 10
     assert cast_type('True') is True
 
+    assert cast_type(' 10 ') == 10
+    assert cast_type('-1_000') == -1000
+    assert cast_type('007') == '007'
+    assert cast_type('00') == 0
+    assert cast_type('1__0') == '1__0'
+    assert cast_type('--1') == '--1'
+    assert cast_type('1.5') == 1.5
+    assert cast_type('1e3') == 1000.0
+    assert cast_type('0x10') == 16
+    assert cast_type('inf') == 'inf'
+    assert cast_type('None') is None
+    assert cast_type('') == ''
+    assert cast_type('"quoted"') == 'quoted'
+    assert cast_type('set()') == set()
+    assert cast_type('[') == '['
+    assert cast_type(5) == 5
+    assert cast_type(5, str) == 5
+
+    # cached mutable values are not shared
+    casted = cast_type('[1, 2]')
+    casted.append(3)
+    assert cast_type('[1, 2]') == [1, 2]
+
+    assert cast_type('10', int) == 10
+    assert cast_type('10', float) == 10.0
+    assert cast_type('10', str) == '10'
+    assert cast_type('yes', bool) is True
+    assert cast_type('Off', bool) is False
+    assert cast_type('bogus', bool) == 'bogus'
+    assert cast_type('bogus', int) == 'bogus'
+    assert cast_type('80.5', int) == 80.5
+    # only known converters are used, other types are literal-evaluated
+    assert cast_type('[1]', list) == [1]
+    assert cast_type('{"a": 1}', dict) == {'a': 1}
+    assert cast_type('a,b', list) == 'a,b'
+
 
 def test_read_envfile(datafix_dir):
 
@@ -40,3 +88,174 @@ def test_read_envfile(datafix_dir):
     assert entries['ENVBOXTST_OTHER'] == 'mine this $VAL enim'
 
     del env['ENVBOXTST_CHANGE']
+
+
+def test_iter_envfile(datafix_dir):
+
+    entries = iter_envfile(datafix_dir / '.env')
+
+    assert next(entries) == ('ENVBOXTST_MYQUOTED1', 'some quoted ')
+
+    entries = dict(entries)
+    assert len(entries) == 9
+    assert entries['ENVBOXTST_MULTI3'] == 'three\nfour=4"5\nfive '
+    assert entries['ENVBOXTST_OTHER'] == '${ENVBOXTST_MYVAL1} ${ENVBOXTST_CHANGE} $VAL ${ENVBOXTST_MYVAL2}'
+
+    assert not list(iter_envfile(datafix_dir / 'bogus'))
+
+
+def test_iter_envfile_mmap(datafix_dir, tmp_path):
+
+    for fname in ('.env', '.env.development', '.env.local', '.env.dev.local'):
+        fpath = datafix_dir / fname
+        assert list(iter_envfile(fpath, use_mmap=True)) == list(iter_envfile(fpath))
+
+    assert not list(iter_envfile(datafix_dir / 'bogus', use_mmap=True))
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('')
+    assert not list(iter_envfile(envfile, use_mmap=True))
+
+    envfile.write_text(
+        'MMAP_ONE=1\nOTHER_MULTI="a\nb=2\nc"\nMMAP_TWO="ключ"\nOTHER_TWO=x\nMMAP_MULTI="\nd\n"',
+        encoding='utf-8',
+    )
+
+    expected = [('MMAP_ONE', '1'), ('MMAP_TWO', 'ключ'), ('MMAP_MULTI', 'd\n')]
+
+    for use_mmap in (True, False):
+        assert list(iter_envfile(envfile, prefix='MMAP_', use_mmap=use_mmap, encoding='utf-8')) == expected
+
+    assert read_envfile(envfile, prefix='OTHER_', use_mmap=True, encoding='utf-8') == {
+        'OTHER_MULTI': 'a\nb=2\nc', 'OTHER_TWO': 'x',
+    }
+
+    for use_mmap in (True, False):
+        assert read_envfile(envfile, include=['OTHER_TWO', 'MMAP_ONE'], use_mmap=use_mmap) == {
+            'MMAP_ONE': '1', 'OTHER_TWO': 'x',
+        }
+        assert read_envfile(envfile, prefix='OTHER_', include=['MMAP_ONE'], use_mmap=use_mmap) == {
+            'MMAP_ONE': '1', 'OTHER_MULTI': 'a\nb=2\nc', 'OTHER_TWO': 'x',
+        }
+        assert read_envfile(envfile, include=[], use_mmap=use_mmap) == {}
+
+    # CRLF line endings, non-ASCII values and keys
+    envfile.write_bytes('MMAP_ONE="ключ\r\nшлюз"\r\nMMAP_ДВА=2\r\n'.encode())
+
+    for use_mmap in (True, False):
+        assert list(iter_envfile(envfile, use_mmap=use_mmap, encoding='utf-8')) == [
+            ('MMAP_ONE', 'ключ\nшлюз'), ('MMAP_ДВА', '2'),
+        ]
+
+    # limitations: CR line endings, non-ASCII lowercase keys
+    envfile.write_bytes(b'MMAP_ONE=1\rMMAP_TWO=2\r')
+    assert list(iter_envfile(envfile, use_mmap=True)) == [('MMAP_ONE', '1\rMMAP_TWO=2')]
+
+    envfile.write_bytes('MMAP_ONE="a\nключ=1\n"\n'.encode())
+    assert list(iter_envfile(envfile, encoding='utf-8')) == [('MMAP_ONE', 'a\nключ=1\n')]
+    assert list(iter_envfile(envfile, use_mmap=True, encoding='utf-8'))[1] == ('ключ', '1')
+
+
+def test_expand_vars():
+
+    assert expand_vars({
+        'A': '${B}/${C}',
+        'B': 'b${C}',
+        'C': 'c',
+        'D': '${UNKNOWN} ${A}',
+        'E': '${EXT}',
+    }, {'EXT': 'ext', 'C': 'ext_c'}.get) == {
+        'A': 'bext_c/ext_c',
+        'B': 'bext_c',
+        'C': 'c',
+        'D': '${UNKNOWN} bext_c/ext_c',
+        'E': 'ext',
+    }
+
+    # long chains
+    count = 5000
+    env_vars = {f'V{idx}': f'${{V{idx + 1}}}' for idx in range(count)}
+    env_vars[f'V{count}'] = 'end'
+    assert expand_vars(env_vars)['V0'] == 'end'
+
+    with pytest.raises(ValueError, match='A -> B -> C -> A'):
+        expand_vars({'A': '${B}', 'B': '${C}', 'C': '${A}'})
+
+    # self-references are left as is
+    assert expand_vars({'A': '${A}:x', 'B': '${A}/${B}'}) == {'A': '${A}:x', 'B': '${A}:x/${B}'}
+
+    # external values break cycles
+    assert expand_vars({'A': '${A}:x'}, {'A': 'a'}.get) == {'A': 'a:x'}
+
+
+def test_read_envfile_self_reference(tmp_path):
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('ENVBOXSELF_PATH=${ENVBOXSELF_PATH}:src\n')
+
+    assert read_envfile(envfile) == {'ENVBOXSELF_PATH': '${ENVBOXSELF_PATH}:src'}
+
+
+def test_envfiles_snapshot(tmp_path, monkeypatch):
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('ENVBOXSNAP_ONE=1\nENVBOXSNAP_TWO=${ENVBOXSNAP_ONE}2\n')
+
+    snapshot_path = tmp_path / 'envbox.snapshot'
+    snapshot = EnvfilesSnapshot(snapshot_path)
+
+    pairs = snapshot.tokenize(envfile)
+    assert pairs == (('ENVBOXSNAP_ONE', '1'), ('ENVBOXSNAP_TWO', '${ENVBOXSNAP_ONE}2'))
+    assert snapshot.tokenize(envfile) is pairs
+    assert snapshot.read(envfile) == {'ENVBOXSNAP_ONE': '1', 'ENVBOXSNAP_TWO': '12'}
+    assert snapshot.tokenize(tmp_path / 'bogus') == ()
+
+    snapshot.save()
+    assert not snapshot.changed
+    assert not list(tmp_path.glob('*.tmp'))
+
+    # loaded from file
+    snapshot_loaded = EnvfilesSnapshot(snapshot_path)
+    assert snapshot_loaded.entries == snapshot.entries
+
+    # file changed
+    envfile.write_text('ENVBOXSNAP_ONE=111\n')
+    assert snapshot_loaded.read(envfile) == {'ENVBOXSNAP_ONE': '111'}
+    assert snapshot_loaded.changed
+
+    # unsupported version
+    with monkeypatch.context() as patch:
+        patch.setattr(EnvfilesSnapshot, 'version', 0)
+        assert not EnvfilesSnapshot(snapshot_path).entries
+
+    # corrupted
+    snapshot_path.write_bytes(b'bogus')
+    assert not EnvfilesSnapshot(snapshot_path).entries
+
+    # not writable
+    snapshot = EnvfilesSnapshot(tmp_path / 'bogus' / 'envbox.snapshot')
+    snapshot.tokenize(envfile)
+    snapshot.save()
+    assert snapshot.changed
+
+    # not replaceable: temporary file is removed
+    snapshot = EnvfilesSnapshot(tmp_path / 'dir.snapshot')
+    snapshot.path.mkdir()
+    snapshot.tokenize(envfile)
+    snapshot.save()
+    assert snapshot.changed
+    assert not list(tmp_path.glob('*.tmp'))
+
+    assert get_snapshot() is get_snapshot('')
+
+
+def test_lazy_attrs():
+
+    assert utils.RE_TPL_VAR.findall('${A} ${B}') == [('${A}', 'A'), ('${B}', 'B')]
+
+    with pytest.raises(AttributeError):
+        utils.bogus  # noqa: B018
+
+
+def test_aread_envfile(datafix_dir):
+    assert asyncio.run(aread_envfile(datafix_dir / '.env.local')) == read_envfile(datafix_dir / '.env.local')
@@ -0,0 +1,126 @@
+import os
+from time import sleep
+
+from envbox.envs import Development
+
+
+def test_watcher(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(Development, 'envfiles_roots', [f'{tmp_path}'])
+    monkeypatch.setenv('ENVBOXWTC_PRESET', 'preset')
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('ENVBOXWTC_ONE=1\nENVBOXWTC_TWO=2\nENVBOXWTC_PRESET=fromfile\n')
+
+    env = Development()
+
+    try:
+        assert env.update_from_envfiles() == {'ENVBOXWTC_ONE': (None, '1'), 'ENVBOXWTC_TWO': (None, '2')}
+
+        changes_all = []
+
+        watcher = env.watch_envfiles(on_change=changes_all.append, start=False)
+        assert watcher.check() == {}
+
+        envfile.write_text('ENVBOXWTC_ONE=100\nENVBOXWTC_PRESET=changed\n')
+        (tmp_path / '.env.local').write_text('ENVBOXWTC_THREE=3\n')
+
+        # value changed outside
+        env['ENVBOXWTC_TWO'] = 'outside'
+
+        changes = watcher.check()
+        assert changes == {'ENVBOXWTC_ONE': ('1', '100'), 'ENVBOXWTC_THREE': (None, '3')}
+        assert changes_all == [changes]
+        assert env.get('ENVBOXWTC_ONE') == '100'
+        assert env.get('ENVBOXWTC_TWO') == 'outside'
+        assert env.get('ENVBOXWTC_THREE') == '3'
+        assert env.get('ENVBOXWTC_PRESET') == 'preset'
+        assert env.envfiles == (f'{envfile}', f'{tmp_path / ".env.local"}')
+
+        # file removed
+        (tmp_path / '.env.local').unlink()
+        assert watcher.check() == {'ENVBOXWTC_THREE': ('3', None)}
+        assert 'ENVBOXWTC_THREE' not in env
+
+        # touched but not changed
+        os.utime(envfile, ns=(1, 1))
+        assert watcher.check() == {}
+        assert len(changes_all) == 2
+
+        # background polling
+        watcher = env.watch_envfiles(interval=0.01)
+        watcher.start()  # already started
+
+        envfile.write_text('ENVBOXWTC_ONE=1000\n')
+
+        for _ in range(100):
+            if env.get('ENVBOXWTC_ONE') == '1000':
+                break
+            sleep(0.01)
+
+        watcher.stop()
+        watcher.stop()  # already stopped
+
+        assert env.get('ENVBOXWTC_ONE') == '1000'
+
+    finally:
+        env.dropmany(prefix='ENVBOXWTC_')
+
+
+def test_watcher_errors(tmp_path, monkeypatch, caplog):
+
+    monkeypatch.setattr(Development, 'envfiles_roots', [f'{tmp_path}'])
+
+    envfile = tmp_path / '.env'
+    envfile.write_text('ENVBOXWTE_ONE=1\n')
+
+    env = Development()
+
+    def write(contents):
+        # atomically, so that polling does not catch a partially written file
+        envfile_tmp = tmp_path / 'tmp'
+        envfile_tmp.write_text(contents)
+        envfile_tmp.replace(envfile)
+
+    def fail(changes):
+        raise RuntimeError('callback failed')
+
+    try:
+        env.update_from_envfiles()
+
+        changes_all = []
+        watcher = env.watch_envfiles(interval=0.01, on_change=fail, start=False)
+        watcher.callbacks.append(changes_all.append)
+
+        # failing callback does not prevent others
+        envfile.write_text('ENVBOXWTE_ONE=22\n')
+        assert watcher.check() == {'ENVBOXWTE_ONE': ('1', '22')}
+        assert changes_all == [{'ENVBOXWTE_ONE': ('1', '22')}]
+        assert 'callback failed' in caplog.text
+
+        watcher.start()
+
+        # circular reference does not stop polling
+        write('ENVBOXWTE_ONE=${ENVBOXWTE_TWO}\nENVBOXWTE_TWO=${ENVBOXWTE_ONE}\n')
+
+        for _ in range(100):
+            if 'Circular reference' in caplog.text:
+                break
+            sleep(0.01)
+
+        assert 'Circular reference' in caplog.text
+
+        write('ENVBOXWTE_ONE=333\n')
+
+        for _ in range(100):
+            if env.get('ENVBOXWTE_ONE') == '333':
+                break
+            sleep(0.01)
+
+        watcher.stop()
+
+        assert env.get('ENVBOXWTE_ONE') == '333'
+        assert changes_all[-1] == {'ENVBOXWTE_ONE': ('22', '333')}
+
+    finally:
+        env.dropmany(prefix='ENVBOXWTE_')